@@ -1,5 +1,7 @@
 #pragma once
 
+#include <atomic>
+
 #include "NetworkReceiver.h"
 #include "NetworkSender.h"
 #include "Parser.h"
@@ -19,7 +21,8 @@ class System {
         void stop();
 
     private:
-        bool running = false;
+        // Cleared from a signal handler, so it must be a lock-free atomic
+        std::atomic<bool> running{false};
 
         NetworkReceiver* receiver;
         NetworkSender* sender;
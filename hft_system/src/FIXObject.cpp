@@ -10,18 +10,20 @@ void FIXObject::set_field(int tag, const std::string &value) {
     fields[tag] = value;
 }
 
-std::string FIXObject::get_field(int tag) const {
+const std::string &FIXObject::get_field(int tag) const {
     /**
      * @brief Retrieves the value for a given FIX tag.
      *
      * @param tag The FIX tag number.
-     * @return The value associated with the tag, or an empty string if not found.
+     * @return A reference to the value associated with the tag, or to an empty string if not found.
      */
+    static const std::string empty;
+
     auto it = fields.find(tag);
     if (it != fields.end()) {
         return it->second;
     }
-    return "";
+    return empty;
 }
 
 std::string FIXObject::to_string() const {
@@ -31,8 +33,13 @@ std::string FIXObject::to_string() const {
      * @return A string representation of the FIXObject.
      */
     std::string result;
+    result.reserve(fields.size() * 16);
     for (const auto &pair : fields) {
-        result += std::to_string(pair.first) + "=" + pair.second + "\x01";  // SOH delimiter
+        // Append in place rather than building a temporary string per field
+        result += std::to_string(pair.first);
+        result += '=';
+        result += pair.second;
+        result += '\x01';  // SOH delimiter
     }
     return result;
 }
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 #include <arpa/inet.h>
 #include <unistd.h>
+#include <cerrno>
 #include <iostream>
 #include <cstring>
 #include <stdexcept>
@@ -44,6 +45,9 @@ std::string NetworkReceiver::receive_data() {
     int n = recvfrom(sockfd, buffer, BUFFER_SIZE - 1, 0,
                      (struct sockaddr *)&cliaddr, &len);
     if (n < 0) {
+        if (errno == EINTR) {
+            return std::string();  // Interrupted by a signal; let the caller re-check its state
+        }
         perror("recvfrom failed");
         throw std::runtime_error("Error receiving data");
     }
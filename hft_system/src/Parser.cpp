@@ -1,4 +1,5 @@
 #include "Parser.h"
+#include <cstring>
 #include <stdexcept>
 
 FIXObject Parser::parse(const std::string &data)
@@ -24,36 +25,30 @@ FIXObject Parser::parse(const std::string &data)
 
     while (cursor < end)
     {
-        int tag = 0;
-        while (cursor < end && *cursor != '=')
+        // memchr is vectorised in libc, so each delimiter search covers
+        // 16-32 bytes per step instead of one.
+        const char *field_end = static_cast<const char *>(memchr(cursor, '\x01', end - cursor));
+        if (field_end == nullptr)
         {
-            if (*cursor >= '0' && *cursor <= '9')
-            {
-                tag = tag * 10 + (*cursor - '0');
-            }
-            cursor++;
+            field_end = end;
         }
 
-        if (cursor == end || *cursor != '=')
+        const char *eq = static_cast<const char *>(memchr(cursor, '=', field_end - cursor));
+        if (eq != nullptr)
         {
-            break;
-        }
-
-        cursor++;
+            int tag = 0;
+            for (const char *p = cursor; p < eq; p++)
+            {
+                if (*p >= '0' && *p <= '9')
+                {
+                    tag = tag * 10 + (*p - '0');
+                }
+            }
 
-        const char *value_start = cursor;
-        while (cursor < end && *cursor != '\x01')
-        {
-            cursor++;
+            fix_obj.set_field(tag, std::string(eq + 1, field_end - (eq + 1)));
         }
 
-        fix_obj.set_field(tag, std::string(value_start, cursor - value_start));
-
-        if (cursor == end)
-        {
-            break;
-        }
-        cursor++;
+        cursor = field_end + 1;
     }
 
     return fix_obj;
@@ -1,5 +1,8 @@
 #include "System.h"
 
+static_assert(std::atomic<bool>::is_always_lock_free,
+              "System::stop() is called from a signal handler");
+
 System::System() {
     /**
      * @brief Constructs a System object, initializing all components.
@@ -7,7 +10,7 @@ System::System() {
     receiver = new NetworkReceiver(CLIENT_IN_PORT);
     sender = new NetworkSender(RESPONSE_HOST, CLIENT_OUT_PORT);
     handler = new Handler();
-    running = false;
+    running.store(false, std::memory_order_relaxed);
 }
 
 System::~System() {
@@ -23,8 +26,8 @@ void System::start() {
     /**
      * @brief Starts the HFT system, beginning to receive and process messages.
      */
-    running = true;
-    while (running) {
+    running.store(true, std::memory_order_relaxed);
+    while (running.load(std::memory_order_relaxed)) {
         std::string data = receiver->receive_data();
 
         if (data.empty()) {
@@ -34,15 +37,16 @@ void System::start() {
         FIXObject fix_obj = Parser::parse(data);
         FIXObject response = handler->handle_message(fix_obj);
 
-        if (!response.to_string().empty()) {
-            sender->send_data(response.to_string());
+        std::string out = response.to_string();
+        if (!out.empty()) {
+            sender->send_data(out);
         }
     }
 }
 
 void System::stop() {
     /**
-     * @brief Stops the HFT system.
+     * @brief Stops the HFT system. Async-signal-safe.
      */
-    running = false;
+    running.store(false, std::memory_order_relaxed);
 }
\ No newline at end of file
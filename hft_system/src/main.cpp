@@ -1,11 +1,32 @@
 #include "System.h"
 
+#include <csignal>
 #include <iostream>
 #include <string>
 
+namespace {
+    System *active_system = nullptr;
+
+    void handle_signal(int) {
+        if (active_system) {
+            active_system->stop();
+        }
+    }
+}
+
 int main() {
     try {
         System hft_system;
+
+        // Stop on SIGINT/SIGTERM so main returns normally (flushing any
+        // -fprofile-generate data). No SA_RESTART, so a blocked recvfrom
+        // is interrupted instead of resumed.
+        active_system = &hft_system;
+        struct sigaction sa {};
+        sa.sa_handler = handle_signal;
+        sigaction(SIGINT, &sa, nullptr);
+        sigaction(SIGTERM, &sa, nullptr);
+
         hft_system.start();
     } catch (const std::exception &e) {
         std::cerr << "Error: " << e.what() << std::endl;
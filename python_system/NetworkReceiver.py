@@ -1,22 +1,54 @@
 import socket
+from typing import List
+
 from dotenv import load_dotenv
 import os
 
+from config import logger
+
 load_dotenv()
 
 CLIENT_IN_PORT = int(os.getenv('CLIENT_IN_PORT'))
 
+# Not exported by the socket module; value from <asm-generic/socket.h>
+SO_BUSY_POLL = getattr(socket, 'SO_BUSY_POLL', 46)
+
 
 class NetworkReceiver():
     """
     Class to receive data from a UDP socket.
     """
-    def __init__(self, host='localhost', port=CLIENT_IN_PORT):
+    def __init__(self, host='localhost', port=CLIENT_IN_PORT, reuse_port=False, busy_poll_us=0):
         self.host = host
         self.port = port
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if reuse_port:
+            # Let several receivers bind the same port; the kernel spreads
+            # incoming flows across them
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        if busy_poll_us:
+            # Spin on the device queue inside recv instead of sleeping until the
+            # interrupt wakes us; values above net.core.busy_read need CAP_NET_ADMIN
+            try:
+                self.sock.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, busy_poll_us)
+            except OSError as exc:
+                logger.warning("SO_BUSY_POLL=%d not applied: %s", busy_poll_us, exc)
         self.sock.bind((self.host, self.port))
 
-    def receive_data(self):
+    def receive_data(self) -> bytes:
         data, addr = self.sock.recvfrom(1024)  # buffer size is 1024 bytes
-        return data.decode('utf-8')
\ No newline at end of file
+        return data
+
+    def receive_batch(self, max_messages=32) -> List[bytes]:
+        """
+        Block until one datagram arrives, then drain up to max_messages - 1
+        more that are already queued on the socket without blocking again.
+        """
+        batch = [self.receive_data()]
+        while len(batch) < max_messages:
+            try:
+                data, addr = self.sock.recvfrom(1024, socket.MSG_DONTWAIT)
+            except BlockingIOError:
+                break
+            batch.append(data)
+        return batch
\ No newline at end of file
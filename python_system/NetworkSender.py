@@ -3,16 +3,49 @@ import socket
 from dotenv import load_dotenv
 import os
 
+import mmsg
+
 load_dotenv()
 
 EXCHANGE_IN_PORT = int(os.getenv('EXCHANGE_IN_PORT'))
 
 class NetworkSender():
-    def __init__(self, host='localhost', port=EXCHANGE_IN_PORT):
+    def __init__(self, host='localhost', port=EXCHANGE_IN_PORT, batch_size=32):
         self.host = host
         self.port = port
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
-    def send_data(self, data):
-        self.sock.sendto(data.encode('utf-8'), (self.host, self.port))
+        # Outbound messages queued by enqueue() until the next flush()
+        self.pending = []
+        self.batch_size = batch_size
+
+        # sockaddr_in for the destination, shared by every mmsghdr slot
+        self._addr = mmsg.sockaddr_in(host, port)
+        self._iovs, self._msgs = mmsg.alloc_headers(batch_size, self._addr)
+
+    def send_data(self, data: bytes):
+        self.sock.sendto(data, (self.host, self.port))
+
+    def enqueue(self, data: bytes):
+        self.pending.append(data)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Send every queued message, using one sendmmsg call per batch where
+        the platform supports it.
+        """
+        pending = self.pending
+        if not pending:
+            return
+
+        if mmsg.sendmmsg is None:
+            for payload in pending:
+                self.sock.sendto(payload, (self.host, self.port))
+            pending.clear()
+            return
 
+        mmsg.fill_iovecs(self._iovs, pending)
+        mmsg.send_all(self.sock.fileno(), self._msgs, len(pending))
+        pending.clear()
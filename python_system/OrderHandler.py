@@ -1,14 +1,14 @@
 """
 Contains logic for handling an order from a parsed fix message
 """
-import simplefix
 import Orderbook
+import Parser
 
 class OrderHandler():
     def __init__(self, orderbook=None):
         self.orderbook = orderbook if orderbook else Orderbook.OrderBook()
 
-    def handle_order(self, fix_message: simplefix.FixMessage):
+    def handle_order(self, fix_message: Parser.FixView) -> bytes:
         # Placeholder for order handling logic
 
         # TODO: Implement order handling logic here
@@ -16,4 +16,4 @@ class OrderHandler():
         # 1. New market data: decide whether to send order, if so return order message
         # 2. Order execution report: update order book accordingly
 
-        return fix_message
\ No newline at end of file
+        return fix_message.buf
\ No newline at end of file
@@ -1,19 +1,62 @@
+import bisect
+
 
 class OrderBook(object):
-    def __init__(self):
+    def __init__(self, tick_size=0.01):
+        self.tick_size = tick_size
+        # Ticks are converted back by dividing by an exact integer, so a
+        # price comes back as the same float it was entered as (0.35, not
+        # 35 * 0.01 == 0.35000000000000003)
+        self.ticks_per_unit = round(1 / tick_size)
+
+        # Sizes keyed by integer price in ticks, so levels hash and compare as
+        # small ints and deletes are not exposed to float equality; use
+        # get_bids()/get_asks() for the levels keyed by price
         self.bids = {}
         self.asks = {}
 
+        # Tick prices of each side in ascending order, so the top of book
+        # is always at one end of the list
+        self.bid_ticks = []
+        self.ask_ticks = []
+
+        # Cached top of book, refreshed by update() whenever a side changes
+        self.best_bid = 0.0
+        self.best_ask = float('inf')
+
+    def to_ticks(self, price):
+        return int(round(price * self.ticks_per_unit))
+
+    def from_ticks(self, tick):
+        return tick / self.ticks_per_unit
+
     def update(self, side, price, size):
+        tick = self.to_ticks(price)
         if side == 'buy':
-            if size == 0:
-                if price in self.bids:
-                    del self.bids[price]
-            else:
-                self.bids[price] = size
+            self._update_level(self.bids, self.bid_ticks, tick, size)
+            self.best_bid = self.from_ticks(self.bid_ticks[-1]) if self.bid_ticks else 0.0
         elif side == 'sell':
-            if size == 0:
-                if price in self.asks:
-                    del self.asks[price]
-            else:
-                self.asks[price] = size
\ No newline at end of file
+            self._update_level(self.asks, self.ask_ticks, tick, size)
+            self.best_ask = self.from_ticks(self.ask_ticks[0]) if self.ask_ticks else float('inf')
+
+    def _update_level(self, levels, ticks, tick, size):
+        if size == 0:
+            if tick in levels:
+                del levels[tick]
+                del ticks[bisect.bisect_left(ticks, tick)]
+        else:
+            if tick not in levels:
+                bisect.insort(ticks, tick)
+            levels[tick] = size
+
+    def get_best_bid(self):
+        return self.best_bid
+
+    def get_best_ask(self):
+        return self.best_ask
+
+    def get_bids(self):
+        return {self.from_ticks(tick): size for tick, size in self.bids.items()}
+
+    def get_asks(self):
+        return {self.from_ticks(tick): size for tick, size in self.asks.items()}
\ No newline at end of file
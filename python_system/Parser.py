@@ -1,16 +1,69 @@
-import simplefix
+import logging
 
 from config import logger
 
+SOH = b'\x01'
+
+
+class FixView(object):
+    """
+    Read-only view over a raw FIX message.
+
+    Fields are stored as tag -> (start, end) offsets into the original
+    buffer, so values are only sliced out when they are asked for.
+    """
+    __slots__ = ('buf', 'fields')
+
+    def __init__(self, buf, fields):
+        self.buf = buf
+        self.fields = fields
+
+    def get_bytes(self, tag, default=None):
+        span = self.fields.get(tag)
+        if span is None:
+            return default
+        return self.buf[span[0]:span[1]]
+
+    def get_int(self, tag, default=None):
+        value = self.get_bytes(tag)
+        return default if value is None else int(value)
+
+    def get_float(self, tag, default=None):
+        value = self.get_bytes(tag)
+        return default if value is None else float(value)
+
+    def __str__(self):
+        return self.buf.replace(SOH, b'|').decode('ascii', errors='replace')
+
+
 class Parser(object):
-    def __init__(self):
-        self.parser = simplefix.FixParser()
+    def decode_fix(self, fix_message: bytes) -> FixView:
+        # FIX is ASCII with SOH delimiters, so it is parsed as raw bytes
+        buf = fix_message
+
+        fields = {}
+        find = buf.find
+        end = len(buf)
+        start = 0
+
+        # Single pass over the buffer: locate each SOH, then the '=' inside it
+        while start < end:
+            soh = find(SOH, start)
+            if soh < 0:
+                soh = end
+
+            eq = find(b'=', start, soh)
+            if eq > start:
+                try:
+                    fields[int(buf[start:eq])] = (eq + 1, soh)
+                except ValueError:
+                    pass  # Non-numeric tag; skip the field
 
-    def decode_fix(self, fix_message):
-        self.parser.append_buffer(fix_message)
+            start = soh + 1
 
-        fix_msg = self.parser.get_message()
+        fix_msg = FixView(buf, fields)
 
-        logger.info("Decoded FIX message: %s", fix_msg)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Decoded FIX message: %s", fix_msg)
 
         return fix_msg
\ No newline at end of file
@@ -1,9 +1,64 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 
-logger = logging.getLogger(__name__)
+# Log records are handed to a background thread for formatting and file I/O
+# so the polling loop never blocks on the log file. Set LOG_LEVEL=WARNING to
+# skip per-message logging entirely.
+#
+# The listener thread belongs to one process, so setup_logging() must run in
+# every process that logs: a forked worker inherits the parent's queue but
+# not the thread draining it.
+_listener = None
+_queue_handler = None
+_started = False
+
+
+def setup_logging(mode='w'):
+    """
+    Start this process's log listener thread writing to system.log and route
+    the root logger through it, replacing any handler inherited on fork.
+
+    Workers pass mode='a' so they do not truncate the parent's log. A later
+    call in the same process stops the running listener first and always
+    appends.
+    """
+    global _listener, _queue_handler, _started
+
+    root = logging.getLogger()
+    if _queue_handler is not None:
+        root.removeHandler(_queue_handler)
+    stop_logging()
+    if _started:
+        mode = 'a'
+
+    log_queue = queue.SimpleQueue()
+
+    file_handler = logging.FileHandler('system.log', mode=mode)
+    file_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
 
-logging.basicConfig(
-    filename='system.log',
-    level=logging.INFO,
-    filemode='w',
-)
+    _listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _listener.start()
+    if not _started:
+        atexit.register(stop_logging)
+        _started = True
+
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO'))
+    root.addHandler(_queue_handler)
+
+
+def stop_logging():
+    """Flush queued records to the file, stop this process's listener and close the file."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+logger = logging.getLogger(__name__)
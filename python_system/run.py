@@ -2,34 +2,99 @@
 Actual execution module for the python-system package.
 """
 
+import argparse
+import gc
+import logging
+import multiprocessing
+import os
+
 import NetworkReceiver, NetworkSender, OrderHandler, Parser, Orderbook
 
-from config import logger
+from config import logger, setup_logging, stop_logging
 
 class System():
-    def __init__(self):
+    def __init__(self, reuse_port=False, busy_poll_us=0):
         self.orderbook = Orderbook.OrderBook()
 
-        self.receiver = NetworkReceiver.NetworkReceiver()
+        self.receiver = NetworkReceiver.NetworkReceiver(
+            reuse_port=reuse_port, busy_poll_us=busy_poll_us
+        )
         self.sender = NetworkSender.NetworkSender()
         self.orderhandler = OrderHandler.OrderHandler(self.orderbook)
         self.parser = Parser.Parser()
 
     def poll(self):
         logger.info("System polling started.")
+
+        # Per-message objects hold no reference cycles and are freed by
+        # refcounting, so the cyclic collector only adds pauses here. Move
+        # everything built during startup out of its reach and turn it off.
+        gc.collect()
+        gc.freeze()
+        gc.disable()
+
         while True:
-            message = self.receiver.receive_data()
-            if message:
+            for message in self.receiver.receive_batch(32):
+                if not message:
+                    continue
+
                 fix_message = self.parser.decode_fix(message)
-                logger.info("Received FIX message: %s", fix_message)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Received FIX message: %s", fix_message)
 
                 # Process the FIX message and update order book accordingly
                 # This is a placeholder for actual processing logic
                 return_message = self.orderhandler.handle_order(fix_message)
-                logger.info("Sending response FIX message: %s", return_message)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Sending response FIX message: %s", return_message)
 
-                self.sender.send_data(return_message)
+                self.sender.enqueue(return_message)
+
+            self.sender.flush()
+
+def run_worker(worker_id, busy_poll_us):
+    """
+    Entry point for one of several System processes sharing the input port.
+    Each worker is pinned to its own core and keeps its own order book.
+    """
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {worker_id % os.cpu_count()})
+
+    # multiprocessing children exit without running atexit handlers, so the
+    # worker stops its own listener to flush what is still queued
+    setup_logging(mode='a')
+    try:
+        system = System(reuse_port=True, busy_poll_us=busy_poll_us)
+        system.poll()
+    finally:
+        stop_logging()
 
 if __name__ == "__main__":
-    system = System()
-    system.poll()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the python HFT system.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of System processes sharing the input port via SO_REUSEPORT (default: 1)",
+    )
+    parser.add_argument(
+        "--busy-poll-us",
+        type=int,
+        default=0,
+        help="SO_BUSY_POLL budget in microseconds for the receive socket (default: 0 = off)",
+    )
+    args = parser.parse_args()
+    setup_logging()
+
+    if args.workers <= 1:
+        system = System(busy_poll_us=args.busy_poll_us)
+        system.poll()
+    else:
+        workers = [
+            multiprocessing.Process(target=run_worker, args=(i, args.busy_poll_us))
+            for i in range(args.workers)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
\ No newline at end of file
@@ -37,11 +37,55 @@ import os
 import socket
 import time
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+
+from . import mmsg
 
 
 SOH = "\x01"
 
+# Every replayed row has the same tag layout, so the whole message is a
+# single bytes template filled with one % per row. %a renders floats with
+# repr(), the same text an f-string would produce.
+MD_INCREMENTAL_TEMPLATE = (  # Market Data Incremental Refresh
+    b"8=FIX.4.4\x0135=X\x01"
+    b"55=%b\x01"
+    b"132=%a\x01"  # best bid price
+    b"133=%a\x01"  # best ask price
+    b"134=%a\x01"  # best bid size
+    b"135=%a\x01"  # best ask size
+)
+
+# Messages due within this window of the first one in a batch are sent
+# together in a single sendmmsg call.
+BATCH_WINDOW_S = 0.001
+MAX_BATCH = 64
+
+
+class _BatchSender:
+    """
+    Sends a list of datagrams to one destination with as few syscalls as
+    possible. The iovec/mmsghdr arrays are built once and reused.
+    """
+
+    def __init__(self, sock: socket.socket, host: str, port: int, size: int = MAX_BATCH):
+        self.sock = sock
+        self.fd = sock.fileno()
+        self.dest = (host, port)
+        self.size = size
+
+        self._addr = mmsg.sockaddr_in(host, port)
+        self._iovs, self._msgs = mmsg.alloc_headers(size, self._addr)
+
+    def send(self, batch: List[bytes]) -> None:
+        if mmsg.sendmmsg is None or len(batch) == 1:
+            for payload in batch:
+                self.sock.sendto(payload, self.dest)
+            return
+
+        mmsg.fill_iovecs(self._iovs, batch)
+        mmsg.send_all(self.fd, self._msgs, len(batch))
+
 
 def _get_int_env(name: str) -> int:
     value = os.getenv(name)
@@ -87,27 +131,106 @@ def build_md_incremental(
     bid_size: float,
     ask: float,
     ask_size: float,
-) -> str:
+) -> bytes:
     """
     Build a minimal FIX Market Data Incremental Refresh (35=X) message.
 
     This is intentionally simple and aimed at exercising the parser and
     strategy logic, not at being a complete FIX implementation.
     """
-    parts = [
-        "8=FIX.4.4",
-        "35=X",  # Market Data Incremental Refresh
-        f"55={symbol}",
-        # Non-standard but parser-friendly encoding:
-        # 132 / 133: bid / ask, 134 / 135: bid_size / ask_size.
-        # This avoids repeating tags, which the simple C++ FIXObject
-        # does not support.
-        f"132={bid}",       # best bid price
-        f"133={ask}",       # best ask price
-        f"134={bid_size}",  # best bid size
-        f"135={ask_size}",  # best ask size
-    ]
-    return SOH.join(parts) + SOH
+    # Non-standard but parser-friendly encoding:
+    # 132 / 133: bid / ask, 134 / 135: bid_size / ask_size.
+    # This avoids repeating tags, which the simple C++ FIXObject
+    # does not support.
+    return MD_INCREMENTAL_TEMPLATE % (
+        symbol.encode("utf-8"),
+        bid,
+        ask,
+        bid_size,
+        ask_size,
+    )
+
+
+def load_messages(
+    csv_path: str,
+    *,
+    timestamp_col: str = "timestamp",
+    symbol_col: str = "symbol",
+    bid_col: str = "bid",
+    bid_size_col: str = "bid_size",
+    ask_col: str = "ask",
+    ask_size_col: str = "ask_size",
+    speed: float = 1.0,
+    symbol_filter: Optional[str] = None,
+) -> Tuple[List[float], List[bytes]]:
+    """
+    Read the whole CSV up front and build every FIX message before replay.
+
+    Returns (delays, messages): messages[i] is the encoded FIX message and
+    delays[i] the (speed-scaled) pause to take before sending it. Rows that
+    are filtered out or have unparsable numeric fields still advance the
+    replay clock, exactly as if they had been read during replay.
+    """
+    with open(csv_path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        try:
+            ts_i, sym_i, bid_i, bid_size_i, ask_i, ask_size_i = (
+                header.index(col)
+                for col in (
+                    timestamp_col,
+                    symbol_col,
+                    bid_col,
+                    bid_size_col,
+                    ask_col,
+                    ask_size_col,
+                )
+            )
+        except ValueError as exc:
+            raise KeyError(f"Missing expected CSV column: {exc}") from exc
+        width = max(ts_i, sym_i, bid_i, bid_size_i, ask_i, ask_size_i)
+
+        delays: List[float] = []
+        messages: List[bytes] = []
+        prev_ts: Optional[float] = None
+
+        for row in reader:
+            # Blank lines, comments and truncated rows
+            if len(row) <= width:
+                continue
+
+            try:
+                ts = _parse_timestamp(row[ts_i])
+            except ValueError:
+                continue
+            delay = (ts - prev_ts) / speed if prev_ts is not None else 0.0
+            prev_ts = ts
+
+            symbol = row[sym_i].strip()
+            if symbol_filter and symbol != symbol_filter:
+                continue
+
+            try:
+                bid = float(row[bid_i])
+                bid_size = float(row[bid_size_i])
+                ask = float(row[ask_i])
+                ask_size = float(row[ask_size_i])
+            except ValueError:
+                # Skip rows with unparsable numeric fields
+                continue
+
+            delays.append(delay)
+            messages.append(
+                build_md_incremental(
+                    symbol=symbol,
+                    bid=bid,
+                    bid_size=bid_size,
+                    ask=ask,
+                    ask_size=ask_size,
+                )
+            )
+
+    return delays, messages
 
 
 def replay_csv(
@@ -127,53 +250,56 @@ def replay_csv(
     """
     Replay market data from a CSV file as FIX messages over UDP.
 
+    The file is parsed and every message encoded before the first send, so
+    the timed replay loop only sleeps and writes to the socket. Messages
+    due within BATCH_WINDOW_S of each other are sent with one sendmmsg.
+
     Returns (rows_sent, wall_clock_seconds).
     """
     if speed <= 0:
         raise ValueError("speed must be positive")
 
+    delays, messages = load_messages(
+        csv_path,
+        timestamp_col=timestamp_col,
+        symbol_col=symbol_col,
+        bid_col=bid_col,
+        bid_size_col=bid_size_col,
+        ask_col=ask_col,
+        ask_size_col=ask_size_col,
+        speed=speed,
+        symbol_filter=symbol_filter,
+    )
+
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender = _BatchSender(sock, host, port)
+
+    # Absolute send time of each message, relative to the start of replay
+    due: List[float] = []
+    t = 0.0
+    for delay in delays:
+        t += delay
+        due.append(t)
 
     sent = 0
     start_wall = time.perf_counter()
-    prev_ts: Optional[float] = None
 
-    with open(csv_path, newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                ts = _parse_timestamp(row[timestamp_col])
-                symbol = row[symbol_col].strip()
-                if symbol_filter and symbol != symbol_filter:
-                    prev_ts = ts
-                    continue
-
-                bid = float(row[bid_col])
-                bid_size = float(row[bid_size_col])
-                ask = float(row[ask_col])
-                ask_size = float(row[ask_size_col])
-            except KeyError as exc:
-                raise KeyError(f"Missing expected CSV column: {exc}") from exc
-            except ValueError:
-                # Skip rows with unparsable numeric fields
-                prev_ts = ts if "ts" in locals() else prev_ts
-                continue
-
-            if prev_ts is not None:
-                delta = (ts - prev_ts) / speed
-                if delta > 0:
-                    time.sleep(delta)
-            prev_ts = ts
-
-            msg = build_md_incremental(
-                symbol=symbol,
-                bid=bid,
-                bid_size=bid_size,
-                ask=ask,
-                ask_size=ask_size,
-            )
-            sock.sendto(msg.encode("utf-8"), (host, port))
-            sent += 1
+    i = 0
+    n = len(messages)
+    while i < n:
+        wait = start_wall + due[i] - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+
+        # Everything due within the batch window goes out in one syscall
+        limit = due[i] + BATCH_WINDOW_S
+        j = i + 1
+        while j < n and j - i < MAX_BATCH and due[j] <= limit:
+            j += 1
+
+        sender.send(messages[i:j])
+        sent += j - i
+        i = j
 
     total_wall = time.perf_counter() - start_wall
     sock.close()
@@ -3,6 +3,9 @@ import time
 
 from test_input import messages
 
+# Encoded once up front; Server sends bytes as-is
+messages = [msg.encode('utf-8') for msg in messages]
+
 def timer(func):
     def wrapper(*args, **kwargs):
         start_time = time.perf_counter()
@@ -0,0 +1,103 @@
+"""
+ctypes bindings for Linux sendmmsg(2) / recvmmsg(2), used by the batched
+UDP senders and receivers in this directory.
+
+python_system, test-exchange, test-exchange_2 and real_data_tests are each
+run on their own with no common import path, so each carries an identical
+copy of this module; change them together.
+
+Where libc lacks these calls, sendmmsg / recvmmsg are None and callers
+fall back to one sendto / recv per message.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import socket
+import struct
+
+_libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+sendmmsg = getattr(_libc, "sendmmsg", None)
+recvmmsg = getattr(_libc, "recvmmsg", None)
+
+# recvmmsg flag: block for the first datagram only (not exported by socket)
+MSG_WAITFORONE = 0x10000
+
+
+class IOVec(ctypes.Structure):
+    _fields_ = [
+        ("iov_base", ctypes.c_void_p),
+        ("iov_len", ctypes.c_size_t),
+    ]
+
+
+class MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class MMsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_hdr", MsgHdr),
+        ("msg_len", ctypes.c_uint),
+    ]
+
+
+def sockaddr_in(host, port):
+    """Return a sockaddr_in for host:port as a ctypes buffer usable as msg_name."""
+    addr = socket.inet_aton(socket.gethostbyname(host))
+    sockaddr = struct.pack("=HH4s8x", socket.AF_INET, socket.htons(port), addr)
+    return ctypes.create_string_buffer(sockaddr, len(sockaddr))
+
+
+def alloc_headers(count, addr=None):
+    """
+    Allocate count single-iovec mmsghdr slots, each pointing at its own
+    iovec, and return (iovs, msgs). With addr (see sockaddr_in) every slot
+    is addressed to it; otherwise the socket must be connected.
+
+    Callers keep the arrays (and addr) alive and reuse them for every batch,
+    only filling in the iovecs per message.
+    """
+    iovs = (IOVec * count)()
+    msgs = (MMsgHdr * count)()
+    for i in range(count):
+        hdr = msgs[i].msg_hdr
+        if addr is not None:
+            hdr.msg_name = ctypes.cast(addr, ctypes.c_void_p)
+            hdr.msg_namelen = ctypes.sizeof(addr)
+        hdr.msg_iov = ctypes.pointer(iovs[i])
+        hdr.msg_iovlen = 1
+    return iovs, msgs
+
+
+def fill_iovecs(iovs, payloads):
+    """Point iovs[i] at payloads[i] (bytes, kept alive by the caller)."""
+    for i, payload in enumerate(payloads):
+        iovs[i].iov_base = ctypes.cast(ctypes.c_char_p(payload), ctypes.c_void_p)
+        iovs[i].iov_len = len(payload)
+
+
+def send_all(fd, msgs, count, retry_errnos=()):
+    """
+    Send the first count prepared messages of msgs with sendmmsg, looping
+    over partial sends. Errors in retry_errnos are retried; any other
+    raises OSError.
+    """
+    sent = 0
+    while sent < count:
+        first = ctypes.byref(msgs, sent * ctypes.sizeof(MMsgHdr))
+        n = sendmmsg(fd, first, count - sent, 0)
+        if n < 0:
+            err = ctypes.get_errno()
+            if err in retry_errnos:
+                continue
+            raise OSError(err, os.strerror(err))
+        sent += n
@@ -1,15 +1,42 @@
+"""
+Random FIX 4.2 message stream generator.
+
+Run as a script, it writes 60000 newline-terminated messages to stdout,
+generated in contiguous MsgSeqNum blocks across a process pool and written
+in MsgSeqNum order. Each block is an independent simulation: every worker
+re-initializes the per-symbol price and volatility walk, and all blocks are
+generated at the same time. At every block boundary the joined stream
+therefore shows a price reset for each symbol and a SendingTime that can
+jump backwards, while MsgSeqNum keeps rising. Consumers that replay the
+stream as one continuous market should treat each block separately or
+generate with a single worker.
+"""
+
+import itertools
+import os
 import random
 import string
-import datetime
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 # FIX field separator
 SOH = "\x01"
 
+# BeginString plus the BodyLength tag; only the length value varies.
+# Messages are built as bytes end to end, ready to hand to a socket.
+HEADER_PREFIX = b"8=FIX.4.2\x019="
+
 # configuration
 SYMBOLS = ["AAPL", "GOOG", "MSFT", "TSLA", "AMZN"]
 CLIENT_IDS = ["CLIENT_A", "CLIENT_B", "CLIENT_C"]
 EXCHANGE_ID = "EXCHANGE_01"
-msg_seq_num = 1
+
+# Encoded once for the bytes templates below
+SYMBOLS_B = [symbol.encode() for symbol in SYMBOLS]
+
+# MsgSeqNum source, shared by all generators
+_next_seq = itertools.count(1).__next__
 
 # Pricing configuration - NOW VARYING BY SYMBOL
 SYMBOL_PRICING = {
@@ -20,8 +47,11 @@ SYMBOL_PRICING = {
     "AMZN": {"base": 180.75, "vol": 2.00},
 }
 
-CURRENT_PRICES = {}
-CURRENT_VOLATILITY = {}
+# Per-symbol state, stored as lists indexed by SYMBOL_ID. Prices are kept
+# unrounded and formatted to two decimals only when a message is built.
+SYMBOL_ID = {symbol: i for i, symbol in enumerate(SYMBOLS)}
+CURRENT_PRICES = [0.0] * len(SYMBOLS)
+CURRENT_VOLATILITY = [0.0] * len(SYMBOLS)
 MIN_VOL = 0.10
 MAX_VOL = 10.00
 
@@ -30,278 +60,287 @@ def initialize_prices():
     global CURRENT_PRICES
     for symbol, config in SYMBOL_PRICING.items():
         start_price = config["base"] + random.uniform(-config["vol"] / 2, config["vol"] / 2)
-        CURRENT_PRICES[symbol] = round(start_price, 2)
+        CURRENT_PRICES[SYMBOL_ID[symbol]] = start_price
 
 def initialize_volatility():
     global CURRENT_VOLATILITY
     for symbol, config in SYMBOL_PRICING.items():
-        CURRENT_VOLATILITY[symbol] = config["vol"]
+        CURRENT_VOLATILITY[SYMBOL_ID[symbol]] = config["vol"]
+
+# ---------------------
+# Bulk random draws
+# random.choices fills a whole batch in one call, which costs less per value
+# than a randint/choice call for every field.
+
+DRAW_BATCH = 1 << 16
+
+def _draws(population):
+    """Endless iterator of uniform draws from population, refilled in batches."""
+    choices = random.choices
+    while True:
+        yield from choices(population, k=DRAW_BATCH)
+
+_senders = _draws([client_id.encode() for client_id in CLIENT_IDS])
+_symbol_ids = _draws(range(len(SYMBOLS)))
+_sides = _draws((1, 2))
+_entry_types = _draws((0, 1))
+_update_actions = _draws((0, 1, 2))
+_md_levels = _draws(range(1, 6))
+_md_sizes = _draws(range(1, 501))
+_order_qtys = _draws(range(1, 201))
+
+# Bound once; random.seed() reseeds the same underlying generator
+_random = random.random
 
 # ---------------------
 # Helper functions
 
+# Maps every byte value onto the ID alphabet (slightly biased towards the
+# first 256 % 36 characters, which is fine for test IDs)
+_ID_CHARS = (string.ascii_uppercase + string.digits).encode()
+_ID_TABLE = bytes(_ID_CHARS[b % len(_ID_CHARS)] for b in range(256))
+
 def rand_id(n=8):
-    """Generate random uppercase alphanumeric ID."""
-    chars = string.ascii_uppercase + string.digits
-    return ''.join(random.choices(chars, k=n))
+    """Generate random uppercase alphanumeric ID (bytes)."""
+    return random.randbytes(n).translate(_ID_TABLE)
 
-def rand_price(symbol=None) -> float:
+def rand_price(sid) -> float:
     """
-    Return random price
+    Return random price for the symbol with id sid
     """
-    global CURRENT_PRICES
-    global CURRENT_VOLATILITY
-
-    price = CURRENT_PRICES.get(symbol)
-    vol = CURRENT_VOLATILITY.get(symbol)
-    vol_step = random.uniform(-0.05, 0.05)
-    new_vol = max(MIN_VOL, min(round(vol + vol_step, 2), MAX_VOL))
-
-    CURRENT_VOLATILITY[symbol] = new_vol
-
-    price_step = random.uniform(-0.1*new_vol, 0.1*new_vol)
-    new_price = max(5.0, round(price + price_step, 2))
-    CURRENT_PRICES[symbol] = new_price
+    price = CURRENT_PRICES[sid]
+    vol = CURRENT_VOLATILITY[sid]
+    # random.uniform is a Python-level wrapper; scale raw random() draws
+    # directly: vol_step in [-0.05, 0.05), price_step in [-0.1, 0.1) * vol
+    vol_step = (_random() - 0.5) * 0.1
+    new_vol = max(MIN_VOL, min(vol + vol_step, MAX_VOL))
+
+    CURRENT_VOLATILITY[sid] = new_vol
+
+    price_step = (_random() - 0.5) * 0.2 * new_vol
+    new_price = max(5.0, price + price_step)
+    CURRENT_PRICES[sid] = new_price
     return new_price
 
+_ts_sec = None
+_ts_prefix = b""
+
 def now_ts():
-    """Return FIX timestamp: YYYYMMDD-HH:MM:SS.sss (Tag 52: SendingTime)"""
-    return datetime.datetime.now().strftime("%Y%m%d-%H:%M:%S.%f")[:-3]
+    """Return FIX timestamp (bytes): YYYYMMDD-HH:MM:SS.sss (Tag 52: SendingTime)"""
+    global _ts_sec, _ts_prefix
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    if sec != _ts_sec:
+        # The date/time part only changes once a second
+        _ts_sec = sec
+        _ts_prefix = time.strftime("%Y%m%d-%H:%M:%S", time.localtime(sec)).encode()
+    return b"%b.%03d" % (_ts_prefix, ns // 1_000_000)
 
 def get_random_sender():
-    """Returns a random client ID."""
-    return random.choice(CLIENT_IDS)
+    """Returns a random client ID (bytes)."""
+    return next(_senders)
 
 def get_random_symbol():
     """Returns a random trade symbol."""
-    return random.choice(SYMBOLS)
+    return SYMBOLS[next(_symbol_ids)]
 
 
 # ---------------------
 # Fix (8, 9, 10)
 
-def compute_checksum(s: str) -> str:
+def compute_checksum(b: bytes) -> bytes:
     """
     FIX checksum (Tag 10) is the sum of all bytes modulo 256,
     formatted as exactly 3 digits with leading zeros.
     """
-    value = sum(ord(c) for c in s) % 256
-    return f"{value:03}"
+    return b"%03d" % (sum(b) & 0xFF)
 
 
-def wrap_fix(fields: dict) -> str:
+def wrap_fix(body_content: bytes) -> bytes:
     """
-    Construct a FIX message from a dictionary of tags, ensuring proper tag ordering
-    and handling of repeating group tags (stored as tuples).
+    Construct a FIX message from an SOH-terminated body whose fields are
+    already in FIX order, adding BeginString, BodyLength and CheckSum.
     """
-
-    header_order = {
-        35: 0, # MsgType
-        49: 1, # SenderCompID
-        56: 2, # TargetCompID
-        34: 3, # MsgSeqNum
-        52: 4, # SendingTime
-    }
-    
-    body_fields_list = list(fields.items())
-    
-    def sort_key(item): # This is needed to handle repeating groups correctly (like 269, 270, 271)
-        tag = item[0]
-        # Repeating group item: (tag_number, index)
-        if isinstance(tag, tuple):
-            tag_num = tag[0]
-            index = tag[1] # Extract the entry index
-            return (1, index, tag_num)
-        
-        # Standard header tag
-        if tag in header_order:
-            return (0, header_order[tag])
-        return (1, tag, 0)
-
-    # Sort the fields according to FIX standards
-    body_fields_list.sort(key=sort_key)
-    
-    body_content = SOH.join(
-        f"{item[0] if isinstance(item[0], int) else item[0][0]}={item[1]}" 
-        for item in body_fields_list
-    ) + SOH
-
     body_length = len(body_content)
-    header = f"8=FIX.4.2{SOH}9={body_length}{SOH}"
+    header = b"%b%d\x01" % (HEADER_PREFIX, body_length)
     msg_without_checksum = header + body_content
     checksum = compute_checksum(msg_without_checksum)
     
-    return msg_without_checksum + f"10={checksum}{SOH}"
+    return msg_without_checksum + b"10=%b\x01" % checksum
+
+# ---------------------
+# Message Templates
+# Each message type has a fixed field layout, so its body is one %-template
+# filled per message. Repeating groups use a per-entry template.
+
+LOGON_TEMPLATE = (
+    f"35=A{SOH}"
+    f"49=%b{SOH}"               # SenderCompID (Client)
+    f"56={EXCHANGE_ID}{SOH}"    # TargetCompID (Exchange)
+    f"34=%d{SOH}"               # MsgSeqNum
+    f"52=%b{SOH}"               # SendingTime
+    f"98=0{SOH}"                # EncryptMethod (None)
+    f"108=30{SOH}"              # HeartBtInt (30 seconds)
+).encode()
+
+SNAPSHOT_TEMPLATE = (
+    f"35=W{SOH}"
+    f"49={EXCHANGE_ID}{SOH}"    # SenderCompID (Exchange)
+    f"56=%b{SOH}"               # TargetCompID (Client)
+    f"34=%d{SOH}"               # MsgSeqNum
+    f"52=%b{SOH}"               # SendingTime
+    f"55=%b{SOH}"               # Symbol
+    f"268=%d{SOH}"              # NoMDEntries
+).encode()
+
+INCREMENTAL_TEMPLATE = (
+    f"35=X{SOH}"
+    f"49={EXCHANGE_ID}{SOH}"    # SenderCompID (Exchange)
+    f"56=%b{SOH}"               # TargetCompID (Client)
+    f"34=%d{SOH}"               # MsgSeqNum
+    f"52=%b{SOH}"               # SendingTime
+    f"55=%b{SOH}"               # Symbol (optional but good for context)
+    f"268=1{SOH}"               # NoMDEntries (One entry for simplicity)
+    f"279=%d{SOH}"              # MDUpdateAction (0=New, 1=Change, 2=Delete)
+).encode()
+
+MD_ENTRY_TEMPLATE = (
+    f"269=%d{SOH}"              # MDEntryType (0=Bid, 1=Offer)
+    f"270=%.2f{SOH}"            # MDEntryPx (symbol-specific)
+    f"271=%d{SOH}"              # MDEntrySize
+).encode()
+
+NEW_ORDER_TEMPLATE = (
+    f"35=D{SOH}"
+    f"49=%b{SOH}"               # SenderCompID (Client)
+    f"56={EXCHANGE_ID}{SOH}"    # TargetCompID (Exchange)
+    f"34=%d{SOH}"               # MsgSeqNum
+    f"52=%b{SOH}"               # SendingTime
+    f"11=%b{SOH}"               # ClOrdID (Client assigned unique ID)
+    f"38=%d{SOH}"               # OrderQty
+    f"40=2{SOH}"                # OrdType (2=Limit)
+    f"44=%.2f{SOH}"             # Price (limit orders only)
+    f"54=%d{SOH}"               # Side (1=Buy, 2=Sell)
+    f"55=%b{SOH}"               # Symbol
+    f"60=%b{SOH}"               # TransactTime
+).encode()
+
+CANCEL_TEMPLATE = (
+    f"35=F{SOH}"
+    f"49=%b{SOH}"               # SenderCompID (Client)
+    f"56={EXCHANGE_ID}{SOH}"    # TargetCompID (Exchange)
+    f"34=%d{SOH}"               # MsgSeqNum
+    f"52=%b{SOH}"               # SendingTime
+    f"11=%b{SOH}"               # ClOrdID (New unique ID for the cancel request)
+    f"38=%d{SOH}"               # OrderQty (Required in place of 152)
+    f"41=%b{SOH}"               # OrigClOrdID (ID of the original order to cancel)
+    f"54=%d{SOH}"               # Side (1=Buy, 2=Sell)
+    f"55=%b{SOH}"               # Symbol
+    f"60=%b{SOH}"               # TransactTime
+).encode()
+
+EXECUTION_REPORT_TEMPLATE = (
+    f"35=8{SOH}"
+    f"49={EXCHANGE_ID}{SOH}"    # SenderCompID (Exchange)
+    f"56=%b{SOH}"               # TargetCompID (Client)
+    f"34=%d{SOH}"               # MsgSeqNum
+    f"52=%b{SOH}"               # SendingTime
+    f"6=%.2f{SOH}"              # AvgPx (Average price, simplified)
+    f"11=%b{SOH}"               # ClOrdID (Client order ID)
+    f"14=%d{SOH}"               # CumQty (Total filled quantity so far)
+    f"17=%b{SOH}"               # ExecID (Unique execution ID for the fill)
+    f"31=%.2f{SOH}"             # LastPx (Price of the fill)
+    f"32=%d{SOH}"               # LastShares (Quantity filled in this report)
+    f"37=%b{SOH}"               # OrderID (Exchange assigned ID)
+    f"38=%d{SOH}"               # OrderQty (Total quantity ordered)
+    f"39=%b{SOH}"               # OrdStatus
+    f"54=%d{SOH}"               # Side
+    f"55=%b{SOH}"               # Symbol
+    f"150=%b{SOH}"              # ExecType (2=Filled, 1=Partial fill)
+    f"151=%d{SOH}"              # LeavesQty (Remaining quantity)
+).encode()
 
 # ---------------------
 # Message Generators
 
 def gen_logon():
     """Generate a valid Logon message (MsgType=A)."""
-    global msg_seq_num
-    sender = get_random_sender()
-    fields = {
-        35: "A",
-        34: msg_seq_num,      # MsgSeqNum 
-        49: sender,           # SenderCompID (Client)
-        56: EXCHANGE_ID,      # TargetCompID (Exchange)
-        52: now_ts(),
-        98: 0,                # EncryptMethod (None)
-        108: 30,              # HeartBtInt (30 seconds)
-    }
-    
-    result = wrap_fix(fields)
-    msg_seq_num += 1
-    return result
+    return wrap_fix(LOGON_TEMPLATE % (get_random_sender(), _next_seq(), now_ts()))
 
 
 def gen_snapshot(symbol=None):
     """Generate a Market Data Snapshot Full Refresh (MsgType=W)."""
-    global msg_seq_num
-    symbol = symbol or get_random_symbol()
-    levels = random.randint(1, 5) # Random number of MD levels
-
-    fields = {
-        35: "W",
-        34: msg_seq_num,      # MsgSeqNum
-        49: EXCHANGE_ID,      # SenderCompID (Exchange)
-        56: get_random_sender(), # TargetCompID (Client)
-        55: symbol,           # Symbol
-        52: now_ts(),
-        268: levels,          # NoMDEntries
-    }
-
-    # Repeating group entries (flattened and appended to the dict)
-    for i in range(levels):
-        # MDEntryType (0=Bid, 1=Offer)
-        fields[(269, i)] = random.choice([0, 1])      
-        # MDEntryPx (now symbol-specific)
-        fields[(270, i)] = rand_price(symbol)         
-        # MDEntrySize
-        fields[(271, i)] = random.randint(1, 500)
-
-    result = wrap_fix(fields)
-    msg_seq_num += 1
-    return result
+    sid = SYMBOL_ID[symbol] if symbol else next(_symbol_ids)
+    symbol = SYMBOLS_B[sid]
+    levels = next(_md_levels) # Random number of MD levels
+
+    body = SNAPSHOT_TEMPLATE % (get_random_sender(), _next_seq(), now_ts(), symbol, levels)
+
+    # Repeating group entries, emitted in order after NoMDEntries
+    entries = [
+        MD_ENTRY_TEMPLATE % (next(_entry_types), rand_price(sid), next(_md_sizes))
+        for _ in range(levels)
+    ]
+
+    return wrap_fix(body + b"".join(entries))
 
 
 def gen_incremental(symbol=None):
     """Generate a Market Data Incremental Refresh (MsgType=X)."""
-    global msg_seq_num
-    symbol = symbol or get_random_symbol()
+    sid = SYMBOL_ID[symbol] if symbol else next(_symbol_ids)
+    symbol = SYMBOLS_B[sid]
     
-    update_action = random.choice([0, 1, 2]) # MDUpdateAction (0=New, 1=Change, 2=Delete)
+    update_action = next(_update_actions) # MDUpdateAction (0=New, 1=Change, 2=Delete)
     
-    fields = {
-        35: "X",
-        34: msg_seq_num,      # MsgSeqNum
-        49: EXCHANGE_ID,      # SenderCompID (Exchange)
-        56: get_random_sender(), # TargetCompID (Client)
-        55: symbol,           # Symbol (optional but good for context)
-        52: now_ts(),
-        268: 1,               # NoMDEntries (One entry for simplicity)
-        279: update_action,
-    }
+    body = INCREMENTAL_TEMPLATE % (get_random_sender(), _next_seq(), now_ts(), symbol, update_action)
     if update_action != 2: # If not Delete, need price and size
-        fields[(269, 0)] = random.choice([0, 1])   # MDEntryType (0=Bid, 1=Offer)
-        fields[(270, 0)] = rand_price(symbol)      
-        fields[(271, 0)] = random.randint(1, 500)  # MDEntrySize
+        body += MD_ENTRY_TEMPLATE % (next(_entry_types), rand_price(sid), next(_md_sizes))
     
-    result = wrap_fix(fields)
-    msg_seq_num += 1
-    return result
+    return wrap_fix(body)
 
 
 def gen_new_order(symbol=None):
     """Generate a New Order Single (MsgType=D)."""
-    global msg_seq_num
     sender = get_random_sender()
-    symbol = symbol or get_random_symbol()
-    curr_price = CURRENT_PRICES[symbol]
-
-    fields = {
-        35: "D",
-        34: msg_seq_num,      # MsgSeqNum
-        49: sender,           # SenderCompID (Client)
-        56: EXCHANGE_ID,      # TargetCompID (Exchange)
-        11: rand_id(),        # ClOrdID (Client assigned unique ID)
-        55: symbol,
-        54: random.choice([1, 2]), # Side (1=Buy, 2=Sell)
-        38: random.randint(1, 200), # OrderQty
-        40: 2,                # OrdType (2=Limit)
-    }
-    if fields[40] == 2:
-        fields[44] = curr_price
-        
-    fields[60] = now_ts()  # TransactTime
-    fields[52] = now_ts()
-
-    result = wrap_fix(fields)
-    msg_seq_num += 1
-    return result
+    sid = SYMBOL_ID[symbol] if symbol else next(_symbol_ids)
+    symbol = SYMBOLS_B[sid]
+    curr_price = CURRENT_PRICES[sid]
+
+    ts = now_ts()  # SendingTime and TransactTime share one stamp
+
+    return wrap_fix(NEW_ORDER_TEMPLATE % (
+        sender, _next_seq(), ts,
+        rand_id(), next(_order_qtys), curr_price, next(_sides), symbol, ts,
+    ))
 
 
 def gen_cancel(symbol=None):
     """Generate an Order Cancel Request (MsgType=F)."""
-    global msg_seq_num
     sender = get_random_sender()
-    symbol = symbol or get_random_symbol()
-
-    fields = {
-        35: "F",
-        34: msg_seq_num,      # MsgSeqNum
-        49: sender,           # SenderCompID (Client)
-        56: EXCHANGE_ID,      # TargetCompID (Exchange)
-        11: rand_id(),        # ClOrdID (New unique ID for the cancel request)
-        41: rand_id(),        # OrigClOrdID (ID of the original order to cancel)
-        55: symbol,
-        54: random.choice([1, 2]), # Side (1=Buy, 2=Sell)
-        60: now_ts(),         # TransactTime
-        38: random.randint(1, 200), # OrderQty (Required in place of 152)
-        52: now_ts(),
-    }
-    
-    result = wrap_fix(fields)
-    msg_seq_num += 1
-    return result
+    sid = SYMBOL_ID[symbol] if symbol else next(_symbol_ids)
+    symbol = SYMBOLS_B[sid]
+
+    ts = now_ts()  # SendingTime and TransactTime share one stamp
+
+    return wrap_fix(CANCEL_TEMPLATE % (
+        sender, _next_seq(), ts,
+        rand_id(), next(_order_qtys), rand_id(), next(_sides), symbol, ts,
+    ))
 
 
 def gen_execution_report(symbol=None):
     """Generate an Execution Report (MsgType=8)."""
-    global msg_seq_num
-    symbol = symbol or get_random_symbol()
-    qty = random.randint(1, 200)
+    sid = SYMBOL_ID[symbol] if symbol else next(_symbol_ids)
+    symbol = SYMBOLS_B[sid]
+    qty = next(_order_qtys)
     filled = random.randint(1, qty) # Always generate at least a partial fill or a full fill
-    last_px = CURRENT_PRICES[symbol]
-
-    fields = {
-        35: "8",
-        34: msg_seq_num,      # MsgSeqNum
-        49: EXCHANGE_ID,      # SenderCompID (Exchange)
-        56: get_random_sender(), # TargetCompID (Client)
-        11: rand_id(),        # ClOrdID (Client order ID)
-        37: rand_id(),        # OrderID (Exchange assigned ID)
-        17: rand_id(6),       # ExecID (Unique execution ID for the fill)
-        150: "2" if filled == qty else "1", # ExecType (2=Filled, 1=Partial fill)
-        39: "2" if filled == qty else "1", 
-        55: symbol,
-        54: random.choice([1, 2]), # Side
-        38: qty,              # OrderQty (Total quantity ordered)
-        
-        # Tag 39: OrdStatus
-        
-        32: filled,           # LastShares (Quantity filled in this report)
-        31: last_px,          # LastPx (Price of the fill)
-        151: qty - filled,    # LeavesQty (Remaining quantity)
-        14: filled,           # CumQty (Total filled quantity so far)
-        6: last_px,           # AvgPx (Average price, simplified)
-        
-        52: now_ts(),
-    }
-    
-    result = wrap_fix(fields)
-    msg_seq_num += 1
-    return result
+    last_px = CURRENT_PRICES[sid]
+    status = b"2" if filled == qty else b"1"
+
+    return wrap_fix(EXECUTION_REPORT_TEMPLATE % (
+        get_random_sender(), _next_seq(), now_ts(),
+        last_px, rand_id(), filled, rand_id(6), last_px, filled, rand_id(),
+        qty, status, next(_sides), symbol, status, qty - filled,
+    ))
 
 
 # ---------------------
@@ -319,13 +358,40 @@ MESSAGE_TYPES = [
 ]
 
 def generate_random_message():
-    """Pick a random message type and return a valid FIX message string."""
+    """Pick a random message type and return a valid FIX message as bytes."""
     generator = random.choice(MESSAGE_TYPES)
     return generator()
 
-if __name__ == "__main__":
-    # Generate and print 5 random FIX messages for debugging
+def generate_chunk(job):
+    """
+    Generate `count` newline-terminated messages numbered from `first_seq`.
+    Runs in a worker process with its own PRNG seed and price state; the
+    prices restart from the symbol bases, so consecutive chunks do not
+    continue each other's walk (see the module docstring).
+    """
+    global _next_seq
+    count, first_seq = job
+    random.seed()
+    _next_seq = itertools.count(first_seq).__next__
     initialize_volatility()
     initialize_prices()
-    for _ in range(60000):
-        print(generate_random_message())
\ No newline at end of file
+    return b"".join([generate_random_message() + b"\n" for _ in range(count)])
+
+if __name__ == "__main__":
+    total = 60000
+    workers = os.cpu_count() or 1
+
+    # Each worker gets a contiguous block of sequence numbers; pool.map
+    # returns the blocks in order, so the output stays sorted by MsgSeqNum.
+    # Prices and SendingTime are not continuous across block boundaries.
+    per_worker = -(-total // workers)
+    jobs = [
+        (min(per_worker, total - start), start + 1)
+        for start in range(0, total, per_worker)
+    ]
+
+    out = sys.stdout.buffer
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(generate_chunk, jobs):
+            out.write(chunk)
+    out.flush()
\ No newline at end of file
@@ -1,29 +1,121 @@
+import ctypes
+import errno
 import socket
 from dotenv import load_dotenv
 import os
 
-load_dotenv()
+import mmsg
+
+# Worker processes inherit the ports from their parent's environment; only
+# search the filesystem for a .env file when they are not already set
+if os.getenv('EXCHANGE_IN_PORT') is None or os.getenv('CLIENT_IN_PORT') is None:
+    load_dotenv()
 
 EXCHANGE_IN_PORT = int(os.getenv('EXCHANGE_IN_PORT'))
 
 CLIENT_IN_PORT = int(os.getenv('CLIENT_IN_PORT'))
 
+# Socket buffer size requested for both directions; bursts of generated
+# messages overflow the kernel default. Capped by net.core.{r,w}mem_max.
+SOCKET_BUFFER_BYTES = 8 << 20
+
+# Datagrams pulled per receive_batch call, and the size of each slot
+RECV_BATCH = 64
+RECV_BUFFER_BYTES = 1024
+
+# Messages handed to the kernel per sendmmsg call in send_batch
+SEND_BATCH = 64
+
+
 class Server(object):
-    def __init__(self, host='localhost', in_port=EXCHANGE_IN_PORT, out_port=CLIENT_IN_PORT):
+    def __init__(self, host='localhost', in_port=EXCHANGE_IN_PORT, out_port=CLIENT_IN_PORT, reuse_port=False):
         self.host = host
         self.in_port = in_port
         self.out_port = out_port
 
         # Setup UDP socket for receiving data
         self.in_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.in_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_BYTES)
+        if reuse_port:
+            # Let several generator processes share the same in_port
+            self.in_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
         self.in_sock.bind((self.host, self.in_port))
 
+        # Reused by every receive_data() instead of allocating a bytes per datagram
+        self._in_buf = bytearray(RECV_BUFFER_BYTES)
+        self._in_view = memoryview(self._in_buf)
+
         # Setup UDP socket for sending data
         self.out_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.out_sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_BYTES)
+
+        # sockaddr_in for the client, shared by every batched message
+        self._out_addr = mmsg.sockaddr_in(self.host, self.out_port)
+
+        # Send headers for sendmmsg, addressed once and reused on every batch
+        self._send_iovs, self._send_msgs = mmsg.alloc_headers(SEND_BATCH, self._out_addr)
+
+        # Receive buffers and headers for recvmmsg, reused on every batch
+        self._recv_bufs = ((ctypes.c_char * RECV_BUFFER_BYTES) * RECV_BATCH)()
+        self._recv_iovs, self._recv_msgs = mmsg.alloc_headers(RECV_BATCH)
+        for i in range(RECV_BATCH):
+            self._recv_iovs[i].iov_base = ctypes.cast(self._recv_bufs[i], ctypes.c_void_p)
+            self._recv_iovs[i].iov_len = RECV_BUFFER_BYTES
 
     def receive_data(self):
-        data, addr = self.in_sock.recvfrom(1024)  # buffer size is 1024 bytes
-        return data.decode('utf-8')
+        n, addr = self.in_sock.recvfrom_into(self._in_buf)  # buffer size is 1024 bytes
+        return str(self._in_view[:n], 'utf-8')
+
+    def receive_batch(self, max_messages=RECV_BATCH):
+        """
+        Block until at least one message arrives, then return it together
+        with any others already queued (up to max_messages), using a single
+        recvmmsg call where the platform supports it.
+        """
+        max_messages = min(max_messages, RECV_BATCH)
+
+        if mmsg.recvmmsg is None:
+            batch = [self.receive_data()]
+            while len(batch) < max_messages:
+                try:
+                    data, addr = self.in_sock.recvfrom(RECV_BUFFER_BYTES, socket.MSG_DONTWAIT)
+                except BlockingIOError:
+                    break
+                batch.append(data.decode('utf-8'))
+            return batch
+
+        while True:
+            n = mmsg.recvmmsg(self.in_sock.fileno(), self._recv_msgs, max_messages, mmsg.MSG_WAITFORONE, None)
+            if n >= 0:
+                break
+            err = ctypes.get_errno()
+            if err != errno.EINTR:
+                raise OSError(err, os.strerror(err))
+
+        return [
+            ctypes.string_at(self._recv_bufs[i], self._recv_msgs[i].msg_len).decode('utf-8')
+            for i in range(n)
+        ]
 
     def send_data(self, data):
-        self.out_sock.sendto(data.encode('utf-8'), (self.host, self.out_port))
\ No newline at end of file
+        """Send one already-encoded message (bytes) to the client."""
+        self.out_sock.sendto(data, (self.host, self.out_port))
+
+    def send_batch(self, messages):
+        """
+        Send a list of already-encoded messages (bytes) to the client, using
+        one sendmmsg call per SEND_BATCH messages where the platform supports it.
+        """
+        if not messages:
+            return
+
+        if mmsg.sendmmsg is None:
+            for payload in messages:
+                self.out_sock.sendto(payload, (self.host, self.out_port))
+            return
+
+        fd = self.out_sock.fileno()
+        for start in range(0, len(messages), SEND_BATCH):
+            chunk = messages[start:start + SEND_BATCH]
+            mmsg.fill_iovecs(self._send_iovs, chunk)
+            mmsg.send_all(fd, self._send_msgs, len(chunk))
\ No newline at end of file
@@ -1,17 +1,35 @@
+import ctypes
+import errno
+import functools
 import os
+import select
 import socket
+import struct
+import sys
+import time
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple, Union
 
 from dotenv import load_dotenv
 
+# Package-style (`from .client import`) and plain script imports both work
+try:  # pragma: no cover - import fallback logic
+    from . import mmsg  # type: ignore[import]
+except ImportError:
+    import mmsg  # type: ignore[import]
 
-load_dotenv()
 
+# Worker processes inherit the ports from their parent's environment; only
+# search the filesystem for a .env file when they are not already set
+if os.getenv("CLIENT_IN_PORT") is None or os.getenv("EXCHANGE_IN_PORT") is None:
+    load_dotenv()
 
-def _get_int_env(name: str) -> int:
+
+def _get_int_env(name: str, default: Optional[int] = None) -> int:
     value = os.getenv(name)
     if value is None:
+        if default is not None:
+            return default
         raise RuntimeError(f"Environment variable {name} is required for tests")
     try:
         return int(value)
@@ -22,6 +40,58 @@ def _get_int_env(name: str) -> int:
 CLIENT_IN_PORT = _get_int_env("CLIENT_IN_PORT")
 EXCHANGE_IN_PORT = _get_int_env("EXCHANGE_IN_PORT")
 
+# Socket buffer size requested for both directions so that bursts are not
+# dropped at the kernel default. Capped by net.core.{r,w}mem_max; override
+# per direction with HFT_RCVBUF / HFT_SNDBUF.
+SOCKET_BUFFER_BYTES = 8 << 20
+RCVBUF_BYTES = _get_int_env("HFT_RCVBUF", SOCKET_BUFFER_BYTES)
+SNDBUF_BYTES = _get_int_env("HFT_SNDBUF", SOCKET_BUFFER_BYTES)
+
+# The socket options below are Linux-only: their numeric fallbacks are the
+# <asm-generic/socket.h> values, which mean other options (or nothing)
+# under SOL_SOCKET elsewhere. On other platforms they are None and skipped.
+_LINUX = sys.platform.startswith("linux")
+
+# Opt-in: spin on the device queue inside recv instead of sleeping until
+# the interrupt wakes us (microseconds, 0 disables, the default); values
+# above net.core.busy_read need CAP_NET_ADMIN and are skipped otherwise.
+BUSY_POLL_US = _get_int_env("HFT_BUSY_POLL_US", 0)
+SO_BUSY_POLL = getattr(socket, "SO_BUSY_POLL", 46) if _LINUX else None
+
+# CPU the test process is pinned to (-1 leaves scheduling alone). The
+# receive socket also asks for its packets to be steered to that CPU with
+# SO_INCOMING_CPU, so the softirq and the reader share a cache.
+PIN_CPU = _get_int_env("HFT_CPU", -1)
+SO_INCOMING_CPU = getattr(socket, "SO_INCOMING_CPU", 49) if _LINUX else None
+
+# Kernel RX timestamps: the stack stamps each datagram on arrival, so RTTs
+# from send_and_receive_times() exclude the wake-up and syscall return
+# after it was queued (set HFT_RX_TIMESTAMPS=0 to stamp in userland).
+# SO_TIMESTAMPNS_NEW carries a 64-bit __kernel_timespec; older kernels
+# only have SO_TIMESTAMPNS with a native struct timespec.
+RX_TIMESTAMPS = _get_int_env("HFT_RX_TIMESTAMPS", 1)
+SO_TIMESTAMPNS_NEW = getattr(socket, "SO_TIMESTAMPNS_NEW", 64) if _LINUX else None
+SO_TIMESTAMPNS = getattr(socket, "SO_TIMESTAMPNS", 35) if _LINUX else None
+_RX_TIMESTAMP_OPTIONS = ((SO_TIMESTAMPNS_NEW, "=qq"), (SO_TIMESTAMPNS, "@ll")) if _LINUX else ()
+
+# RTT clock: CLOCK_MONOTONIC_RAW is never slewed by NTP, unlike the
+# CLOCK_MONOTONIC behind perf_counter_ns; the latter is the fallback where
+# the raw clock does not exist.
+if hasattr(time, "CLOCK_MONOTONIC_RAW"):
+    _now_ns = functools.partial(time.clock_gettime_ns, time.CLOCK_MONOTONIC_RAW)
+else:
+    _now_ns = time.perf_counter_ns
+
+# Batched send/receive goes through mmsg (Linux sendmmsg/recvmmsg); other
+# platforms fall back to one send/recv per message.
+
+# Datagrams drained per recv_many() call, and the size of each slot
+RECV_BATCH = 64
+# Datagrams handed to each sendmmsg() call by send_many(); larger sends
+# are split into chunks of this size over the same reused headers
+SEND_BATCH = 64
+RECV_BUFFER_BYTES = 1024
+
 
 @dataclass
 class UdpClient:
@@ -40,15 +110,93 @@ class UdpClient:
     def __post_init__(self) -> None:
         # Socket for sending requests to the HFT system
         self._send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._send_sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SNDBUF_BYTES)
+        # Connected once, so sends skip the per-datagram address lookup
+        self._send_sock.connect((self.host, self.send_port))
 
         # Socket for receiving responses from the HFT system
         self._recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._recv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RCVBUF_BYTES)
+        if BUSY_POLL_US and SO_BUSY_POLL is not None:
+            try:
+                self._recv_sock.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, BUSY_POLL_US)
+            except OSError:
+                pass
+        if PIN_CPU >= 0 and SO_INCOMING_CPU is not None:
+            try:
+                self._recv_sock.setsockopt(socket.SOL_SOCKET, SO_INCOMING_CPU, PIN_CPU)
+            except OSError:
+                pass
+        # The cmsg type of SCM_TIMESTAMPNS{,_NEW} equals the option enabling it;
+        # None means receive times are taken in userland
+        self._rx_ts_type: Optional[int] = None
+        self._rx_ts_struct = struct.Struct("")
+        if RX_TIMESTAMPS:
+            for option, fmt in _RX_TIMESTAMP_OPTIONS:
+                try:
+                    self._recv_sock.setsockopt(socket.SOL_SOCKET, option, 1)
+                except OSError:
+                    continue
+                self._rx_ts_type, self._rx_ts_struct = option, struct.Struct(fmt)
+                break
+        self._rx_ancbufsize = socket.CMSG_SPACE(self._rx_ts_struct.size) if self._rx_ts_type is not None else 0
         self._recv_sock.bind((self.host, self.recv_port))
         self._recv_sock.settimeout(self.timeout_sec)
 
-    def send(self, msg: str) -> None:
-        """Send a raw FIX string to the HFT system."""
-        self._send_sock.sendto(msg.encode("utf-8"), (self.host, self.send_port))
+        # Readiness waits for recv_many: one epoll registration for the
+        # client's lifetime rather than an fd set built on every select()
+        self._epoll = select.epoll() if hasattr(select, "epoll") else None
+        if self._epoll is not None:
+            self._epoll.register(self._recv_sock.fileno(), select.EPOLLIN)
+
+        # Reused by every receive() instead of allocating a bytes per datagram
+        self._recv_buf = bytearray(4096)
+        self._recv_view = memoryview(self._recv_buf)
+        self._recv_iov = [self._recv_buf]
+
+        # Receive buffers and headers for recvmmsg, reused on every batch
+        self._recv_bufs = ((ctypes.c_char * RECV_BUFFER_BYTES) * RECV_BATCH)()
+        self._recv_iovs, self._recv_msgs = mmsg.alloc_headers(RECV_BATCH)
+        for i in range(RECV_BATCH):
+            self._recv_iovs[i].iov_base = ctypes.cast(self._recv_bufs[i], ctypes.c_void_p)
+            self._recv_iovs[i].iov_len = RECV_BUFFER_BYTES
+
+        # Send-side headers for sendmmsg, likewise reused on every chunk;
+        # only each iovec's base and length change per message
+        self._send_iovs, self._send_msgs = mmsg.alloc_headers(SEND_BATCH)
+
+    def send(self, msg: Union[str, bytes]) -> None:
+        """Send a raw FIX message (str, or already-encoded bytes) to the HFT system."""
+        if isinstance(msg, str):
+            msg = msg.encode("utf-8")
+        try:
+            self._send_sock.send(msg)
+        except ConnectionRefusedError:
+            # A connected UDP socket reports an earlier ICMP port-unreachable
+            # on the next send; the datagram is lost either way and shows up
+            # as a receive timeout, as it did before connect()
+            pass
+
+    def send_many(self, msgs: Sequence[Union[str, bytes]]) -> None:
+        """
+        Send several raw FIX messages to the HFT system, using one sendmmsg
+        call per SEND_BATCH messages where the platform supports it.
+        """
+        payloads = [msg.encode("utf-8") if isinstance(msg, str) else msg for msg in msgs]
+        if not payloads:
+            return
+
+        if mmsg.sendmmsg is None:
+            for payload in payloads:
+                self.send(payload)
+            return
+
+        fd = self._send_sock.fileno()
+        for start in range(0, len(payloads), SEND_BATCH):
+            chunk = payloads[start:start + SEND_BATCH]
+            mmsg.fill_iovecs(self._send_iovs, chunk)
+            # A pending ICMP error is consumed by the failed call; see send()
+            mmsg.send_all(fd, self._send_msgs, len(chunk), retry_errnos=(errno.ECONNREFUSED,))
 
     def receive(self) -> Optional[str]:
         """
@@ -57,42 +205,195 @@ class UdpClient:
         Returns the decoded string, or None if no response before timeout.
         """
         try:
-            data, _addr = self._recv_sock.recvfrom(4096)
+            n, _addr = self._recv_sock.recvfrom_into(self._recv_buf)
         except socket.timeout:
             return None
-        return data.decode("utf-8", errors="replace")
+        # Decode straight out of the reusable buffer, no intermediate bytes
+        return str(self._recv_view[:n], "utf-8", "replace")
+
+    def _receive_stamped(self) -> Tuple[Optional[str], int]:
+        """
+        Receive one response together with the kernel's RX timestamp,
+        translated onto the _now_ns() clock.
+
+        The kernel stamps with CLOCK_REALTIME; the timestamp's age is
+        measured against the wall clock right after recvmsg returns and
+        subtracted from _now_ns() read immediately after. Falls back to
+        _now_ns() if the datagram carried no timestamp.
+        """
+        try:
+            n, ancdata, _flags, _addr = self._recv_sock.recvmsg_into(self._recv_iov, self._rx_ancbufsize)
+        except socket.timeout:
+            return None, _now_ns()
+        # Wall clock first: a preemption between the two reads then only
+        # makes the RTT longer, never shorter than the real one
+        wall_ns = time.time_ns()
+        recv_ns = _now_ns()
+        for level, kind, data in ancdata:
+            if level == socket.SOL_SOCKET and kind == self._rx_ts_type:
+                sec, nsec = self._rx_ts_struct.unpack_from(data)
+                recv_ns -= wall_ns - (sec * 1_000_000_000 + nsec)
+                break
+        return str(self._recv_view[:n], "utf-8", "replace"), recv_ns
+
+    def fileno(self) -> int:
+        """File descriptor of the receive socket, e.g. for an external poller."""
+        return self._recv_sock.fileno()
+
+    def _wait_readable(self, timeout: float) -> bool:
+        """Sleep in the kernel until a response is queued or timeout (s) passes."""
+        if self._epoll is not None:
+            return bool(self._epoll.poll(timeout))
+        return bool(select.select([self._recv_sock], [], [], timeout)[0])
+
+    def recv_many(self, max_batch: int = RECV_BATCH, timeout_ns: Optional[int] = None) -> int:
+        """
+        Wait up to timeout_ns (default: timeout_sec) for responses, then drain
+        up to max_batch already-queued ones with a single recvmmsg call where
+        the platform supports it.
+
+        Returns how many responses were received (0 on timeout). Payloads
+        are discarded; this is for counting replies, not inspecting them.
+        """
+        timeout = self.timeout_sec if timeout_ns is None else timeout_ns * 1e-9
+        if not self._wait_readable(timeout):
+            return 0
+
+        max_batch = min(max_batch, RECV_BATCH)
+        if mmsg.recvmmsg is None:
+            count = 0
+            while count < max_batch and self._wait_readable(0):
+                self._recv_sock.recv_into(self._recv_buf)
+                count += 1
+            return count
 
-    def send_and_receive(self, msg: str) -> Tuple[Optional[str], float]:
+        n = mmsg.recvmmsg(self._recv_sock.fileno(), self._recv_msgs, max_batch, socket.MSG_DONTWAIT, None)
+        if n < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EINTR):
+                return 0
+            raise OSError(err, os.strerror(err))
+        return n
+
+    def drain(self) -> int:
+        """
+        Discard every response already queued on the receive socket without
+        waiting, e.g. late replies from a previous run on a reused client.
+
+        Returns how many were dropped.
+        """
+        dropped = 0
+        while True:
+            n = self.recv_many(timeout_ns=0)
+            if not n:
+                return dropped
+            dropped += n
+
+    def drain_until_quiet(self, quiet_ns: int, max_wait_ns: Optional[int] = None) -> int:
+        """
+        Discard responses until none has arrived for quiet_ns, e.g. late
+        replies still in flight from a saturating run, which drain() would
+        miss because they are not queued yet. Gives up after max_wait_ns
+        (default: no limit) if replies keep arriving.
+
+        Returns how many were dropped.
+        """
+        deadline_ns = None if max_wait_ns is None else time.perf_counter_ns() + max_wait_ns
+        dropped = 0
+        while True:
+            n = self.recv_many(timeout_ns=quiet_ns)
+            if not n:
+                return dropped
+            dropped += n
+            if deadline_ns is not None and time.perf_counter_ns() >= deadline_ns:
+                return dropped
+
+    def send_timed(self, msg: Union[str, bytes]) -> int:
+        """Send a message and return its send time in ns (see send_and_receive_times)."""
+        start_ns = _now_ns()
+        self.send(msg)
+        return start_ns
+
+    def receive_timed(self) -> Tuple[Optional[str], int]:
+        """
+        Receive one response and return (response, recv_time_ns), on the same
+        clock as send_timed(). Response is None on timeout.
+        """
+        if self._rx_ts_type is not None:
+            return self._receive_stamped()
+        response = self.receive()
+        return response, _now_ns()
+
+    def send_and_receive(self, msg: Union[str, bytes]) -> Tuple[Optional[str], float]:
         """
         Convenience helper that sends a message and waits for a single response.
 
         Returns (response, rtt_seconds).
         If there is no response before timeout, response is None and rtt is the elapsed time.
         """
-        import time
-
         start = time.perf_counter()
         self.send(msg)
         response = self.receive()
         end = time.perf_counter()
         return response, end - start
 
-    def send_and_receive_times(self, msg: str) -> Tuple[Optional[str], int, int]:
+    def send_and_receive_discard(self, msg: Union[str, bytes]) -> Tuple[bool, float]:
         """
-        Send a message and return (response, send_time_ns, recv_time_ns).
+        Like send_and_receive(), but the response is read into the reused
+        receive buffer and never decoded.
 
-        Times are taken from time.perf_counter_ns() so that the caller can
-        compute precise round-trip latency and construct detailed traces.
+        Returns (got_response, rtt_seconds), for callers that only care
+        whether the system answered.
         """
-        import time
-
-        start_ns = time.perf_counter_ns()
+        start = time.perf_counter()
         self.send(msg)
-        response = self.receive()
-        end_ns = time.perf_counter_ns()
+        try:
+            self._recv_sock.recv_into(self._recv_buf)
+            got_response = True
+        except socket.timeout:
+            got_response = False
+        end = time.perf_counter()
+        return got_response, end - start
+
+    def send_and_receive_times(self, msg: Union[str, bytes]) -> Tuple[Optional[str], int, int]:
+        """
+        Send a message and return (response, send_time_ns, recv_time_ns).
+
+        Times are in nanoseconds from CLOCK_MONOTONIC_RAW (perf_counter_ns()
+        where unavailable) so that the caller can compute precise round-trip
+        latency and construct detailed traces. With kernel RX timestamps
+        enabled, recv_time_ns is when the response reached the socket rather
+        than when this process got to read it.
+        """
+        start_ns = self.send_timed(msg)
+        response, end_ns = self.receive_timed()
         return response, start_ns, end_ns
 
+    def send_many_and_receive_times(
+        self, msgs: Sequence[Union[str, bytes]]
+    ) -> Tuple[int, List[Tuple[str, int]]]:
+        """
+        Send msgs in one send_many() batch, then collect up to len(msgs)
+        responses, stopping early if none arrives within timeout_sec.
+
+        Returns (send_time_ns, [(response, recv_time_ns), ...]) on the clock of
+        send_and_receive_times(); each recv time is the response's own kernel
+        RX timestamp when enabled, so how fast this loop drains the socket
+        does not affect the measured RTTs.
+        """
+        start_ns = _now_ns()
+        self.send_many(msgs)
+        received: List[Tuple[str, int]] = []
+        for _ in range(len(msgs)):
+            response, recv_ns = self.receive_timed()
+            if response is None:
+                break
+            received.append((response, recv_ns))
+        return start_ns, received
+
     def close(self) -> None:
+        if self._epoll is not None:
+            self._epoll.close()
         self._send_sock.close()
         self._recv_sock.close()
 
@@ -1,19 +1,29 @@
+import os
+
 import pytest
 
 # Import the local client helper that lives alongside this file.
 # We avoid relative imports here because pytest loads conftest.py
 # as a top-level module (no package context).
-from client import UdpClient
+from client import PIN_CPU, UdpClient
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def client() -> UdpClient:
     """
     Pytest fixture providing a UDP test client that talks to the running HFT system.
 
     Assumes the HFT system is already running and listening on CLIENT_IN_PORT /
-    EXCHANGE_IN_PORT as defined in the environment.
+    EXCHANGE_IN_PORT as defined in the environment. One client (and one
+    connected send socket) serves every test module in the session. With
+    HFT_CPU set, the test process is pinned to that CPU so latency tests are
+    not migrated mid-measurement.
     """
+    if PIN_CPU >= 0:
+        try:
+            os.sched_setaffinity(0, {PIN_CPU})
+        except (AttributeError, OSError) as exc:
+            print(f"CPU affinity {PIN_CPU} not applied: {exc}")
     c = UdpClient()
     try:
         yield c
@@ -21,3 +31,11 @@ def client() -> UdpClient:
         c.close()
 
 
+@pytest.fixture(autouse=True)
+def _drain_stragglers(request):
+    """Discard late responses after each test so they are not read by the next one."""
+    yield
+    if "client" in request.fixturenames:
+        request.getfixturevalue("client").drain()
+
+
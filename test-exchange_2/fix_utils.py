@@ -5,57 +5,139 @@ These helpers avoid bringing in simplefix and are only intended for
 parsing/constructing messages in assertions, not for production use.
 """
 
-from typing import Dict
+import random
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping
 
 SOH = "\x01"
+SOH_BYTES = b"\x01"  # for messages built directly as bytes
 
+# Distinct raw messages whose parse results parse_fix keeps around
+PARSE_CACHE_SIZE = 4096
 
-def parse_fix(raw: str) -> Dict[str, str]:
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_fix(raw: str) -> Mapping[str, str]:
     """
-    Parse a FIX string into a simple tag -> value dictionary.
+    Parse a FIX string into a simple tag -> value mapping.
 
     - Ignores empty segments
     - Keeps the last occurrence of a tag (e.g. in repeating groups)
+
+    Results are memoized per raw string, since soak runs see the same
+    response many times; the mapping is a read-only view so the shared
+    cached result cannot be modified (copy with dict() if needed).
     """
     fields: Dict[str, str] = {}
     if not raw:
-        return fields
+        return MappingProxyType(fields)
+
+    malformed: List[str] = []
+    for part in raw.split(SOH):
+        # One scan per field: partition finds the first '=' and splits on it
+        tag, sep, value = part.partition("=")
+        if sep:
+            fields[tag] = value
+        elif part:
+            malformed.append(part)
+
+    if malformed:
+        # Malformed fields; stored under a synthetic key for debugging
+        fields["_malformed"] = "|".join(malformed) + "|"
+    return MappingProxyType(fields)
 
-    parts = raw.split(SOH)
-    for part in parts:
-        if not part:
-            continue
-        if "=" not in part:
-            # Malformed field; store under a synthetic key for debugging
-            fields.setdefault("_malformed", "")
-            fields["_malformed"] += part + "|"
-            continue
-        tag, value = part.split("=", 1)
-        fields[tag] = value
-    return fields
 
+def get_field(raw: str, tag: str) -> str:
+    """
+    Return the value of the first occurrence of tag in raw, or "" if absent.
 
-def gen_new_order(symbol: str = "AAPL", price: float = 150.0, qty: int = 100) -> str:
+    For code that needs one or two fields of a response: a couple of
+    str.partition calls instead of building parse_fix's full mapping.
+    Unlike parse_fix, the first occurrence wins.
+    """
+    key = tag + "="
+    # A leading field has no SOH before it and precedes any later repeat
+    if raw.startswith(key):
+        rest = raw[len(key):]
+    else:
+        _, sep, rest = raw.partition(SOH + key)
+        if not sep:
+            return ""
+    return rest.partition(SOH)[0]
+
+
+# Constant part of gen_new_order's message up to the symbol value, and the
+# %-format for the remaining fields
+_NEW_ORDER_PREFIX = b"8=FIX.4.4\x0135=D\x0149=CLIENT_TEST\x0156=EXCHANGE_TEST\x0155="
+_NEW_ORDER_SUFFIX = b"\x0154=1\x0138=%d\x0144=%a\x0140=2\x01"  # 54=1 Buy, 40=2 Limit
+# Same fields with the price given as whole units and cents
+_NEW_ORDER_TICKS_SUFFIX = b"\x0154=1\x0138=%d\x0144=%d.%02d\x0140=2\x01"
+
+# Price increment of the tick-based helpers: one cent
+TICKS_PER_UNIT = 100
+
+
+def gen_new_order(symbol: str = "AAPL", price: float = 150.0, qty: int = 100) -> bytes:
     """
     Generate a simple New Order Single (35=D) suitable for end-to-end tests.
 
     This is intentionally minimal and does not compute a real checksum.
     The production exchange / C++ parser should still handle it as a basic
     New Order message for functional testing purposes.
+
+    Returns the encoded message so it can be handed to UdpClient.send as is.
     """
     # Note: we do not set tags 8/9/10 for simplicity here; many parsers
     # (including yours) only care about the tag=value pairs, not checksums.
-    parts = [
-        "8=FIX.4.4",
-        "35=D",
-        "49=CLIENT_TEST",
-        "56=EXCHANGE_TEST",
-        "55=" + symbol,
-        "54=1",  # Buy
-        f"38={qty}",
-        f"44={price}",
-        "40=2",  # Limit
-    ]
-    return SOH.join(parts) + SOH
+    return _NEW_ORDER_PREFIX + symbol.encode("ascii") + _NEW_ORDER_SUFFIX % (qty, price)
+
+
+def gen_new_order_from_ticks(symbol: str = "AAPL", ticks: int = 15000, qty: int = 100) -> bytes:
+    """
+    gen_new_order with the price given as an integer number of cents.
+
+    FIX prices here are quantized to cents anyway, so callers can keep
+    prices as ints and skip float rounding; the decimal price is produced
+    by integer division in the format itself.
+    """
+    units, cents = divmod(ticks, TICKS_PER_UNIT)
+    return _NEW_ORDER_PREFIX + symbol.encode("ascii") + _NEW_ORDER_TICKS_SUFFIX % (qty, units, cents)
+
+
+def make_order_builder(symbol: str) -> Callable[[int, float], bytes]:
+    """
+    Return build(qty, price) -> bytes producing gen_new_order(symbol, price, qty).
+
+    The symbol is baked into a single per-symbol bytes format once, so each
+    call is one %-format with no symbol encode or concatenation. Intended
+    for loops that send many orders for the same symbol.
+    """
+    fmt = _NEW_ORDER_PREFIX + symbol.encode("ascii") + _NEW_ORDER_SUFFIX
+
+    def build(qty: int, price: float) -> bytes:
+        return fmt % (qty, price)
+
+    return build
+
+
+def precompute_orders(
+    n: int,
+    symbol: str = "AAPL",
+    base_price: float = 150.0,
+) -> List[bytes]:
+    """
+    Pre-generate n New Order Singles for a benchmark to send from a ring.
+
+    Each order jitters the price by up to +/-1.0 around base_price on the
+    cent grid and draws a quantity in [1, 500], matching what the soak loop
+    used to generate per message.
+    """
+    fmt = _NEW_ORDER_PREFIX + symbol.encode("ascii") + _NEW_ORDER_TICKS_SUFFIX
+    base_ticks = round(base_price * TICKS_PER_UNIT)
+    # One bulk draw per field instead of two randint() calls per order
+    ticks = random.choices(range(base_ticks - TICKS_PER_UNIT, base_ticks + TICKS_PER_UNIT + 1), k=n)
+    qtys = random.choices(range(1, 501), k=n)
+    return [fmt % (qty, *divmod(t, TICKS_PER_UNIT)) for qty, t in zip(qtys, ticks)]
 
 
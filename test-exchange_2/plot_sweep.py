@@ -0,0 +1,142 @@
+"""
+Draw the three-panel sweep summary (latency histogram, latency CDF and
+firehose throughput) from a sweep metadata file.
+
+run.py and run_2.py write the metadata after their sweeps and start this
+script in the background, so the runner does not wait on rendering:
+
+    python test-exchnage_2/plot_sweep.py sweep_meta.json --output sweep_summary.png
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+
+# Plain imports so this also works when launched as a script by path
+from latency_plot import cdf_points, load_rtt_us
+
+# CDF points drawn per series in the overlay plots; more are not visible
+CDF_OVERLAY_POINTS = 2000
+
+
+def plot_summary_three_panel(points: List[Dict[str, Any]], output: str) -> None:
+    """
+    Single figure with three panels, written to output:
+    - Left: latency histogram overlay (RTT-based sweep)
+    - Middle: latency CDF overlay (RTT-based sweep)
+    - Right: firehose effective throughput vs exponent (2**n)
+
+    points are the per-exponent dicts from run_combined_sweep; the latency
+    panels use those with a csv_path, the firehose panel all of them. The
+    firehose panel is drawn even when no point has latency data.
+    """
+    if not points:
+        print("Not enough data to build three-panel summary figure.")
+        return
+
+    fig, (ax_hist, ax_cdf, ax_fire) = plt.subplots(1, 3, figsize=(15, 4))
+
+    # Build latency series from CSVs.
+    series_latencies_us = []
+    for point in points:
+        if not point.get("csv_path"):
+            continue
+        latencies_us = load_rtt_us(point["csv_path"])
+        if latencies_us.size:
+            series_latencies_us.append((f"2^{point['exp']}", latencies_us))
+
+    # Left: histogram overlay
+    for label, latencies_us in series_latencies_us:
+        counts, edges = np.histogram(latencies_us, bins=50)
+        ax_hist.stairs(counts, edges, fill=True, alpha=0.4, label=label)
+    ax_hist.set_xlabel("RTT (µs)")
+    ax_hist.set_ylabel("Count")
+    ax_hist.set_title("Latency histogram (all rates)")
+
+    # Middle: CDF overlay
+    for label, latencies_us in series_latencies_us:
+        xs, ys = cdf_points(latencies_us, CDF_OVERLAY_POINTS)
+        ax_cdf.plot(xs, ys, label=label)
+    ax_cdf.set_xlabel("RTT (µs)")
+    ax_cdf.set_ylabel("CDF")
+    ax_cdf.set_title("Latency CDF (all rates)")
+
+    if series_latencies_us:
+        ax_hist.legend(fontsize="small")
+        ax_cdf.legend(fontsize="small")
+    else:
+        print("No latency data found for summary figure; drawing the firehose panel only.")
+        for ax in (ax_hist, ax_cdf):
+            ax.text(0.5, 0.5, "No latency data", ha="center", va="center", transform=ax.transAxes)
+
+    # Right: firehose throughput vs exponent
+    try:
+        exps = [p["exp"] for p in points]
+        eff = [p["firehose_rate"] for p in points]
+        ax_fire.plot(exps, eff, marker="o")
+        ax_fire.set_xlabel("Exponent n (rate ≈ 2**n msg/s)")
+        ax_fire.set_ylabel("Effective throughput (msg/s)")
+        ax_fire.set_title("Firehose: throughput vs 2**n")
+        ax_fire.grid(True, linestyle="--", alpha=0.3)
+    except Exception:
+        ax_fire.text(0.5, 0.5, "Firehose plot failed", ha="center", va="center")
+
+    fig.tight_layout()
+    fig.savefig(output, dpi=120, bbox_inches="tight")
+    print(f"Summary figure written to {output}")
+
+
+def spawn_summary_plot(
+    points: List[Dict[str, Any]],
+    meta_path: str = "sweep_meta.json",
+    output: str = "sweep_summary.png",
+) -> subprocess.Popen:
+    """
+    Write the sweep points to meta_path and render the summary figure in a
+    background process; returns without waiting for it.
+    """
+    with open(meta_path, "w") as f:
+        json.dump({"points": points, "output": output}, f)
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plot_sweep.py")
+    env = dict(os.environ, MPLBACKEND="Agg")
+    return subprocess.Popen([sys.executable, script, meta_path], env=env)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Plot the three-panel sweep summary from sweep metadata.")
+    parser.add_argument(
+        "meta",
+        type=str,
+        help="JSON file written by spawn_summary_plot (sweep points and output path)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Image file to write (default: the output recorded in the metadata)",
+    )
+
+    args = parser.parse_args()
+    # Off-screen rendering only; no GUI toolkit or display needed
+    matplotlib.use("Agg")
+
+    with open(args.meta) as f:
+        meta = json.load(f)
+
+    plot_summary_three_panel(meta["points"], args.output or meta.get("output", "sweep_summary.png"))
+
+
+if __name__ == "__main__":
+    main()
+
+
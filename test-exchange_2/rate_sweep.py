@@ -2,8 +2,9 @@
 Sweep powers-of-two send rates and watch where latency starts to increase.
 
 This script calls run_soak() programmatically for rates = 2^k and stops
-once p99 latency grows beyond a configurable threshold compared to the
-previous step.
+once p99 or p99.9 latency grows beyond a configurable threshold compared
+to the previous step, then bisects between those two rates to locate the
+knee to within --tol.
 
 Run from the project root (with the HFT system already running):
 
@@ -17,7 +18,39 @@ from __future__ import annotations
 import argparse
 from typing import List, Dict, Any
 
-from .soak_benchmark import run_soak
+from .client import UdpClient
+from .soak_benchmark import pin_sender, run_soak
+
+
+def _run_point(args: argparse.Namespace, requested_rate: float, client: UdpClient) -> Dict[str, Any] | None:
+    stats = run_soak(
+        num_messages=args.messages,
+        output_path=f"soak_{int(requested_rate)}.csv" if args.save_csv else None,
+        symbol=args.symbol,
+        base_price=args.base_price,
+        rate=requested_rate,
+        client=client,
+    )
+    if stats:
+        print(
+            f"Summary: effective_rate={stats['effective_rate']:.1f} msg/s, "
+            f"p99={stats['p99']/1e3:.1f} µs, p999={stats['p999']/1e3:.1f} µs"
+        )
+    return stats
+
+
+def _tail_breach(prev: Dict[str, Any], stats: Dict[str, Any], args: argparse.Namespace) -> str | None:
+    """
+    Describe the first tail percentile that grew past its threshold factor
+    relative to prev, or return None if both are within bounds.
+    """
+    for key, factor in (("p99", args.p99_threshold), ("p999", args.p999_threshold)):
+        if stats[key] > prev[key] * factor:
+            return (
+                f"{key} increased beyond threshold factor {factor:.2f} "
+                f"(prev {prev[key]/1e3:.1f} µs -> now {stats[key]/1e3:.1f} µs)"
+            )
+    return None
 
 
 def main() -> None:
@@ -59,49 +92,101 @@ def main() -> None:
         default=1.8,
         help="Stop when p99 grows by this factor vs previous step (default: 1.2 = +20%%)",
     )
+    parser.add_argument(
+        "--p999-threshold",
+        type=float,
+        default=1.8,
+        help="Stop when p99.9 grows by this factor vs previous step (default: 1.8 = +80%%)",
+    )
 
-    args = parser.parse_args()
-
-    results: List[Dict[str, Any]] = []
-    prev_p99: float | None = None
-
-    for exp in range(args.min_exp, args.max_exp + 1):
-        requested_rate = float(2 ** exp)
-        print(f"\n=== Testing rate 2**{exp} = {requested_rate:.0f} msg/s ===")
-
-        stats = run_soak(
-            num_messages=args.messages,
-            output_path=f"soak_{int(requested_rate)}.csv",
-            symbol=args.symbol,
-            base_price=args.base_price,
-            rate=requested_rate,
-        )
+    parser.add_argument(
+        "--tol",
+        type=float,
+        default=0.1,
+        help="Refine the knee until the bracketing rates are within this ratio (default: 0.1 = 10%%)",
+    )
 
-        if not stats:
-            print("No stats returned, stopping sweep.")
-            break
+    parser.add_argument(
+        "--save-csv",
+        action="store_true",
+        help="Also write per-message results to soak_<rate>.csv for each point (default: keep in memory only)",
+    )
+    parser.add_argument(
+        "--cpu",
+        type=int,
+        default=None,
+        help="Pin the benchmark to this CPU, ideally one reserved with isolcpus= (default: no pinning)",
+    )
+    parser.add_argument(
+        "--fifo-priority",
+        type=int,
+        default=None,
+        help="Run under SCHED_FIFO at this priority; needs CAP_SYS_NICE (default: normal scheduling)",
+    )
 
-        results.append(stats)
+    args = parser.parse_args()
+    pin_sender(args.cpu, args.fifo_priority)
 
-        p99 = stats["p99"]
-        eff_rate = stats["effective_rate"]
-        print(f"Summary: effective_rate={eff_rate:.1f} msg/s, p99={p99/1e3:.1f} µs")
+    results: List[Dict[str, Any]] = []
+    prev: Dict[str, Any] | None = None
+    breached: Dict[str, Any] | None = None
+
+    # One socket pair for every point instead of re-binding per rate
+    client = UdpClient()
+    try:
+        for exp in range(args.min_exp, args.max_exp + 1):
+            requested_rate = float(2 ** exp)
+            print(f"\n=== Testing rate 2**{exp} = {requested_rate:.0f} msg/s ===")
+
+            stats = _run_point(args, requested_rate, client)
+            if not stats:
+                print("No stats returned, stopping sweep.")
+                break
+
+            results.append(stats)
+
+            if prev is not None:
+                reason = _tail_breach(prev, stats, args)
+                if reason:
+                    print(f"{reason}. Stopping.")
+                    breached = stats
+                    break
+
+            prev = stats
+
+        # The knee lies between the last good power of two and the one that
+        # tripped a threshold; bisect that interval instead of stopping at 2x.
+        if prev is not None and breached is not None:
+            lo, hi = prev, breached
+            while hi["requested_rate"] / lo["requested_rate"] > 1 + args.tol:
+                mid_rate = (lo["requested_rate"] + hi["requested_rate"]) / 2
+                print(f"\n=== Refining rate {mid_rate:.0f} msg/s ===")
+
+                stats = _run_point(args, mid_rate, client)
+                if not stats:
+                    print("No stats returned, stopping refinement.")
+                    break
+
+                results.append(stats)
+                if _tail_breach(lo, stats, args):
+                    hi = stats
+                else:
+                    lo = stats
 
-        if prev_p99 is not None and p99 > prev_p99 * args.p99_threshold:
             print(
-                f"p99 increased beyond threshold factor {args.p99_threshold:.2f} "
-                f"(prev {prev_p99/1e3:.1f} µs -> now {p99/1e3:.1f} µs). Stopping."
+                f"\nLatency knee between {lo['requested_rate']:.0f} and "
+                f"{hi['requested_rate']:.0f} msg/s"
             )
-            break
-
-        prev_p99 = p99
+    finally:
+        client.close()
 
     print("\nSweep complete. Collected points:")
-    for r in results:
+    for r in sorted(results, key=lambda r: r["requested_rate"]):
         print(
             f"requested={r['requested_rate']:.0f} msg/s, "
             f"effective={r['effective_rate']:.1f} msg/s, "
-            f"p50={r['p50']/1e3:.1f} µs, p99={r['p99']/1e3:.1f} µs, "
+            f"p50={r['p50']/1e3:.1f} µs, p95={r['p95']/1e3:.1f} µs, "
+            f"p99={r['p99']/1e3:.1f} µs, p999={r['p999']/1e3:.1f} µs, "
             f"max={r['max']/1e3:.1f} µs"
         )
 
@@ -22,16 +22,29 @@ from __future__ import annotations
 
 import argparse
 import sys
-import csv
-import random
-import statistics
-import time
+from time import perf_counter, perf_counter_ns, sleep
 from typing import Any, Dict, List, Tuple
 
 import matplotlib.pyplot as plt
+import numpy as np
 
 from client import UdpClient
-from fix_utils import gen_new_order, parse_fix
+from fix_utils import precompute_orders
+from latency_plot import cdf_points, load_rtt_us
+from plot_sweep import spawn_summary_plot
+from soak_benchmark import ORDER_RING_MASK, ORDER_RING_SIZE, run_soak
+
+# Most messages the firehose hands to a single sendmmsg call
+FIREHOSE_BATCH = 64
+
+# Before each RTT soak in the combined sweep, wait until no reply has
+# arrived for this long, so late firehose replies are not timed as RTTs;
+# give up waiting after SWEEP_SETTLE_MAX_NS
+SWEEP_QUIET_NS = 100_000_000
+SWEEP_SETTLE_MAX_NS = 5_000_000_000
+
+# CDF points drawn per series in the overlay plots; more are not visible
+CDF_OVERLAY_POINTS = 2000
 
 
 # ---------------------------------------------------------------------------
@@ -98,173 +111,64 @@ def run_latency_smoke_test(client: UdpClient) -> bool:
         return False
 
 
-# ---------------------------------------------------------------------------
-# Soak benchmark (adapted from soak_benchmark.py so we can call it directly)
-# ---------------------------------------------------------------------------
-
-
-def run_soak(
-    num_messages: int,
-    output_path: str,
-    symbol: str,
-    base_price: float,
-    rate: float | None,
-) -> Dict[str, Any] | None:
-    """
-    High-volume UDP soak benchmark for the HFT system.
-
-    Returns a stats dict (same keys as soak_benchmark.run_soak) or None if
-    no responses were received.
-    """
-    client = UdpClient()
-    latencies_ns: List[int] = []
-    start_wall = time.perf_counter()
-
-    with open(output_path, mode="w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["seq", "send_ns", "recv_ns", "rtt_ns", "msg_type"])
-
-        interval: float | None = None
-        if rate and rate > 0:
-            interval = 1.0 / rate
-
-        for i in range(num_messages):
-            loop_start = time.perf_counter()
-
-            # Add a bit of randomness around the base price to simulate market movement.
-            price = round(base_price + random.uniform(-1.0, 1.0), 2)
-            qty = random.randint(1, 500)
-
-            msg = gen_new_order(symbol=symbol, price=price, qty=qty)
-
-            response, send_ns, recv_ns = client.send_and_receive_times(msg)
-            rtt_ns = recv_ns - send_ns
-            msg_type = ""
-            if response is not None:
-                parsed = parse_fix(response)
-                msg_type = parsed.get("35", "")
-                latencies_ns.append(rtt_ns)
-
-            writer.writerow([i, send_ns, recv_ns, rtt_ns, msg_type])
-
-            # Throttle to approximate the requested send rate, if provided.
-            if interval is not None:
-                elapsed = time.perf_counter() - loop_start
-                remaining = interval - elapsed
-                if remaining > 0:
-                    time.sleep(remaining)
-
-    client.close()
-    total_wall = time.perf_counter() - start_wall
-
-    if not latencies_ns:
-        print(
-            f"No responses received during soak run (output={output_path}). "
-            "Check that the HFT system is running and ports are correct."
-        )
-        return None
-
-    latencies_ns.sort()
-    count = len(latencies_ns)
-    p50 = _percentile(latencies_ns, 50)
-    p99 = _percentile(latencies_ns, 99)
-    jitter = statistics.pstdev(latencies_ns) if count > 1 else 0.0
-    effective_rate = count / total_wall if total_wall > 0 else 0.0
-
-    print(
-        f"\nSoak benchmark ({output_path}):\n"
-        f"  Responses collected: {count}\n"
-        f"  min={latencies_ns[0]/1e3:.1f} µs, "
-        f"p50={p50/1e3:.1f} µs, "
-        f"p99={p99/1e3:.1f} µs, "
-        f"max={latencies_ns[-1]/1e3:.1f} µs, "
-        f"jitter(stddev)={jitter/1e3:.1f} µs\n"
-        f"  Effective throughput ≈ {effective_rate:.1f} msg/s\n"
-        f"  Results written to {output_path}"
-    )
-
-    return {
-        "requested_rate": rate,
-        "effective_rate": effective_rate,
-        "count": count,
-        "min": latencies_ns[0],
-        "p50": p50,
-        "p99": p99,
-        "max": latencies_ns[-1],
-        "jitter": jitter,
-        "total_wall_s": total_wall,
-        "output_path": output_path,
-    }
-
-
-def _percentile(sorted_values: List[int], pct: float) -> float:
-    """Simple percentile helper: pct in [0, 100]."""
-    if not sorted_values:
-        return 0.0
-    k = (len(sorted_values) - 1) * pct / 100.0
-    f = int(k)
-    c = min(f + 1, len(sorted_values) - 1)
-    if f == c:
-        return float(sorted_values[f])
-    d0 = sorted_values[f] * (c - k)
-    d1 = sorted_values[c] * (k - f)
-    return d0 + d1
-
-
-# ---------------------------------------------------------------------------
-# Firehose benchmark (send without per-message wait)
-# ---------------------------------------------------------------------------
-
-
 def _firehose_run_once(
     num_messages: int,
     symbol: str,
     base_price: float,
     rate: float,
     receive_window_s: float = 2.0,
+    client: UdpClient | None = None,
 ) -> Dict[str, Any]:
     """
     Send many messages without waiting for each individual response.
 
-    - Phase 1: send num_messages at the target rate using client.send()
-    - Phase 2: for a fixed window, keep calling receive() to count replies
+    - Phase 1: send num_messages at the target rate using client.send_many()
+    - Phase 2: for a fixed window, keep calling recv_many() to count replies
 
     This is meant to stress throughput / capacity, not measure exact RTTs.
     """
-    import time
-
-    client = UdpClient()
-    start_wall = time.perf_counter()
+    owns_client = client is None
+    if client is None:
+        client = UdpClient()
+    else:
+        client.drain()
+    start_wall = perf_counter()
 
-    interval: float | None = None
+    interval_ns: int | None = None
     if rate > 0:
-        interval = 1.0 / rate
-
-    # Phase 1: firehose send
-    for _ in range(num_messages):
-        loop_start = time.perf_counter()
-
-        price = round(base_price + random.uniform(-1.0, 1.0), 2)
-        qty = random.randint(1, 500)
-        msg = gen_new_order(symbol=symbol, price=price, qty=qty)
-        client.send(msg)
-
-        if interval is not None:
-            elapsed = time.perf_counter() - loop_start
-            remaining = interval - elapsed
-            if remaining > 0:
-                time.sleep(remaining)
-
-    # Phase 2: receive for a fixed window
+        interval_ns = int(1e9 / rate)
+
+    # Phase 1: firehose send. Messages are scheduled against absolute due
+    # times; whatever is already due goes out together in one send_many call
+    # (up to FIREHOSE_BATCH), so low rates still send one message at a time.
+    # Orders (price/qty jitter included) are built before the clock starts.
+    orders = precompute_orders(ORDER_RING_SIZE, symbol, base_price)
+    batch: List[bytes] = []
+    send_start_ns = perf_counter_ns()
+    for i in range(num_messages):
+        batch.append(orders[i & ORDER_RING_MASK])
+
+        next_due_ns = send_start_ns + (i + 1) * interval_ns if interval_ns is not None else 0
+        if len(batch) >= FIREHOSE_BATCH or i + 1 == num_messages or next_due_ns > perf_counter_ns():
+            client.send_many(batch)
+            batch = []
+            if interval_ns is not None:
+                slack_ns = next_due_ns - perf_counter_ns()
+                if slack_ns > 0:
+                    sleep(slack_ns * 1e-9)
+
+    # Phase 2: receive for a fixed window, draining queued replies in batches
     responses = 0
-    recv_start = time.perf_counter()
-    while time.perf_counter() - recv_start < receive_window_s:
-        resp = client.receive()
-        if resp is not None:
-            responses += 1
+    recv_deadline_ns = perf_counter_ns() + int(receive_window_s * 1e9)
+    while True:
+        remaining_ns = recv_deadline_ns - perf_counter_ns()
+        if remaining_ns <= 0:
+            break
+        responses += client.recv_many(timeout_ns=remaining_ns)
 
-    total_wall = time.perf_counter() - start_wall
-    client.close()
+    total_wall = perf_counter() - start_wall
+    if owns_client:
+        client.close()
 
     effective_rate = responses / total_wall if total_wall > 0 else 0.0
     return {
@@ -284,6 +188,7 @@ def run_firehose_sweep(
     min_exp: int,
     max_exp: int,
     exp_step: int,
+    client: UdpClient | None = None,
 ) -> List[Dict[str, Any]]:
     """
     Sweep powers-of-two offered load using the firehose benchmark.
@@ -301,6 +206,11 @@ def run_firehose_sweep(
 
     results: List[Dict[str, Any]] = []
 
+    # One socket pair for every point instead of re-binding per rate
+    owns_client = client is None
+    if client is None:
+        client = UdpClient()
+
     for exp in range(min_exp, max_exp + 1, max(1, exp_step)):
         # Use an integer rate to avoid float overflow at very large exponents.
         # For extremely large exponents this number is not physically meaningful
@@ -313,6 +223,7 @@ def run_firehose_sweep(
             symbol=symbol,
             base_price=base_price,
             rate=float(requested_rate),
+            client=client,
         )
         stats["exp"] = exp
         results.append(stats)
@@ -323,6 +234,9 @@ def run_firehose_sweep(
             f"effective_rate≈{stats['effective_rate']:.1f} msg/s"
         )
 
+    if owns_client:
+        client.close()
+
     if results:
         print("\nFirehose sweep complete. Collected points:")
         for r in results:
@@ -351,6 +265,7 @@ def run_power_of_two_sweep(
     max_exp: int,
     exp_step: int,
     p99_threshold: float,
+    client: UdpClient | None = None,
 ) -> Tuple[List[Dict[str, Any]], List[str]]:
     """
     Sweep powers-of-two send rates and stop when p99 latency degrades.
@@ -367,6 +282,11 @@ def run_power_of_two_sweep(
     csv_paths: List[str] = []
     prev_p99: float | None = None
 
+    # One socket pair for every point instead of re-binding per rate
+    owns_client = client is None
+    if client is None:
+        client = UdpClient()
+
     for exp in range(min_exp, max_exp + 1, max(1, exp_step)):
         requested_rate = float(2**exp)
         # Use exponent-based filenames to avoid extremely long paths when exp is large.
@@ -379,6 +299,7 @@ def run_power_of_two_sweep(
             symbol=symbol,
             base_price=base_price,
             rate=requested_rate,
+            client=client,
         )
         if not stats:
             print("No stats returned; stopping sweep.")
@@ -404,6 +325,9 @@ def run_power_of_two_sweep(
 
         prev_p99 = p99
 
+    if owns_client:
+        client.close()
+
     if results:
         print("\nSweep complete. Collected points:")
         for r in results:
@@ -419,6 +343,119 @@ def run_power_of_two_sweep(
     return results, csv_paths
 
 
+def run_combined_sweep(
+    messages: int,
+    firehose_messages: int,
+    symbol: str,
+    base_price: float,
+    min_exp: int,
+    max_exp: int,
+    exp_step: int,
+    p99_threshold: float,
+    client: UdpClient | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Single pass over 2**exp rates running the RTT soak and the firehose
+    back to back at each rate, over one client.
+
+    The RTT soak stops once p99 grows beyond p99_threshold (as in
+    run_power_of_two_sweep); the firehose continues over the whole range.
+    Each RTT soak waits for the previous firehose's late replies to stop
+    arriving first (see SWEEP_QUIET_NS), since the soak pairs replies with
+    requests by order only.
+
+    Returns one point per exponent with keys exp, requested_rate,
+    csv_path/p50/p99/effective_rate (None once the RTT soak has stopped)
+    and firehose_rate/firehose_responses/firehose_sent.
+    """
+    print(
+        "\n=== Combined RTT + firehose sweep ===\n"
+        f"Messages per rate point: {messages} RTT, {firehose_messages} firehose, "
+        f"exponents: {min_exp}..{max_exp} (step {exp_step}), p99 threshold factor: {p99_threshold}"
+    )
+
+    points: List[Dict[str, Any]] = []
+    prev_p99: float | None = None
+    rtt_active = True
+
+    # One socket pair for every point and both benchmarks
+    owns_client = client is None
+    if client is None:
+        client = UdpClient()
+
+    for exp in range(min_exp, max_exp + 1, max(1, exp_step)):
+        requested_rate = float(2**exp)
+        print(f"\n--- Rate 2**{exp} = {requested_rate:.0f} msg/s ---")
+        point: Dict[str, Any] = {
+            "exp": exp,
+            "requested_rate": requested_rate,
+            "csv_path": None,
+            "p50": None,
+            "p99": None,
+            "effective_rate": None,
+        }
+
+        if rtt_active:
+            client.drain_until_quiet(SWEEP_QUIET_NS, SWEEP_SETTLE_MAX_NS)
+            output_path = f"soak_2pow{exp}.csv"
+            stats = run_soak(
+                num_messages=messages,
+                output_path=output_path,
+                symbol=symbol,
+                base_price=base_price,
+                rate=requested_rate,
+                client=client,
+            )
+            if stats:
+                point.update(
+                    csv_path=output_path,
+                    p50=stats["p50"],
+                    p99=stats["p99"],
+                    effective_rate=stats["effective_rate"],
+                )
+                p99 = stats["p99"]
+                if prev_p99 is not None and p99 > prev_p99 * p99_threshold:
+                    print(
+                        "p99 increased beyond threshold factor "
+                        f"{p99_threshold:.2f} "
+                        f"(prev {prev_p99/1e3:.1f} µs -> now {p99/1e3:.1f} µs). "
+                        "Stopping RTT measurements; firehose continues."
+                    )
+                    rtt_active = False
+                prev_p99 = p99
+            else:
+                print("No stats returned; stopping RTT measurements.")
+                rtt_active = False
+
+        firehose = _firehose_run_once(
+            num_messages=firehose_messages,
+            symbol=symbol,
+            base_price=base_price,
+            rate=requested_rate,
+            client=client,
+        )
+        point.update(
+            firehose_rate=firehose["effective_rate"],
+            firehose_responses=firehose["responses"],
+            firehose_sent=firehose["sent"],
+        )
+        points.append(point)
+
+        p99_text = f"{point['p99']/1e3:.1f} µs" if point["p99"] is not None else "n/a"
+        print(
+            f"Summary: p99={p99_text}, "
+            f"firehose effective_rate≈{point['firehose_rate']:.1f} msg/s "
+            f"({point['firehose_responses']}/{point['firehose_sent']} responses)"
+        )
+
+    if owns_client:
+        client.close()
+
+    if not points:
+        print("\nCombined sweep produced no data.")
+    return points
+
+
 def plot_combined_latency_hist_and_cdf(
     csv_paths: List[str], sweep_results: List[Dict[str, Any]]
 ) -> None:
@@ -428,27 +465,14 @@ def plot_combined_latency_hist_and_cdf(
     Left subplot: overlapping histograms (one per rate).
     Right subplot: overlapping CDF curves (one per rate).
     """
-    series_latencies_us: List[Tuple[str, List[float]]] = []
+    series_latencies_us: List[Tuple[str, np.ndarray]] = []
 
     for stats, path in zip(sweep_results, csv_paths):
-        latencies_ns: List[int] = []
-        with open(path, newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    rtt_ns = int(row["rtt_ns"])
-                except (KeyError, ValueError):
-                    continue
-                if rtt_ns > 0:
-                    latencies_ns.append(rtt_ns)
-
-        if not latencies_ns:
+        latencies_us = load_rtt_us(path)
+        if not latencies_us.size:
             print(f"No latency data found in {path}; skipping in combined plot.")
             continue
 
-        latencies_us = [x / 1e3 for x in latencies_ns]
-        latencies_us.sort()
-
         # Prefer labeling by exponent (2^n) for clarity when rates are huge.
         exp = stats.get("exp")
         if exp is not None:
@@ -467,7 +491,8 @@ def plot_combined_latency_hist_and_cdf(
     # Histogram overlay
     plt.subplot(1, 2, 1)
     for label, latencies_us in series_latencies_us:
-        plt.hist(latencies_us, bins=50, alpha=0.4, label=label)
+        counts, edges = np.histogram(latencies_us, bins=50)
+        plt.stairs(counts, edges, fill=True, alpha=0.4, label=label)
     plt.xlabel("RTT (µs)")
     plt.ylabel("Count")
     plt.title("Latency histogram (all rates)")
@@ -476,9 +501,7 @@ def plot_combined_latency_hist_and_cdf(
     # CDF overlay
     plt.subplot(1, 2, 2)
     for label, latencies_us in series_latencies_us:
-        n = len(latencies_us)
-        xs = latencies_us
-        ys = [i / (n - 1) for i in range(n)] if n > 1 else [1.0]
+        xs, ys = cdf_points(latencies_us, CDF_OVERLAY_POINTS)
         plt.plot(xs, ys, label=label)
     plt.xlabel("RTT (µs)")
     plt.ylabel("CDF")
@@ -489,84 +512,6 @@ def plot_combined_latency_hist_and_cdf(
     plt.show()
 
 
-def plot_summary_three_panel(
-    csv_paths: List[str],
-    sweep_results: List[Dict[str, Any]],
-    firehose_results: List[Dict[str, Any]],
-) -> None:
-    """
-    Draw a single figure with three panels:
-    - Left: latency histogram overlay (RTT-based sweep)
-    - Middle: latency CDF overlay (RTT-based sweep)
-    - Right: firehose effective throughput vs exponent (2**n)
-    """
-    if not sweep_results or not csv_paths or not firehose_results:
-        print("Not enough data to build three-panel summary figure.")
-        return
-
-    fig, (ax_hist, ax_cdf, ax_fire) = plt.subplots(1, 3, figsize=(15, 4))
-
-    # Build latency series from CSVs (same logic as combined plot).
-    series_latencies_us: List[Tuple[str, List[float]]] = []
-    for stats, path in zip(sweep_results, csv_paths):
-        latencies_ns: List[int] = []
-        with open(path, newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    rtt_ns = int(row["rtt_ns"])
-                except (KeyError, ValueError):
-                    continue
-                if rtt_ns > 0:
-                    latencies_ns.append(rtt_ns)
-        if not latencies_ns:
-            continue
-
-        latencies_us = [x / 1e3 for x in latencies_ns]
-        latencies_us.sort()
-        exp = stats.get("exp")
-        label = f"2^{exp}" if exp is not None else f"{stats.get('requested_rate', 0.0):.0f} msg/s"
-        series_latencies_us.append((label, latencies_us))
-
-    if not series_latencies_us:
-        print("No latency data found for summary figure.")
-        return
-
-    # Left: histogram overlay
-    for label, latencies_us in series_latencies_us:
-        ax_hist.hist(latencies_us, bins=50, alpha=0.4, label=label)
-    ax_hist.set_xlabel("RTT (µs)")
-    ax_hist.set_ylabel("Count")
-    ax_hist.set_title("Latency histogram (all rates)")
-    ax_hist.legend(fontsize="small")
-
-    # Middle: CDF overlay
-    for label, latencies_us in series_latencies_us:
-        n = len(latencies_us)
-        xs = latencies_us
-        ys = [i / (n - 1) for i in range(n)] if n > 1 else [1.0]
-        ax_cdf.plot(xs, ys, label=label)
-    ax_cdf.set_xlabel("RTT (µs)")
-    ax_cdf.set_ylabel("CDF")
-    ax_cdf.set_title("Latency CDF (all rates)")
-    ax_cdf.legend(fontsize="small")
-
-    # Right: firehose throughput vs exponent
-    try:
-        exps = [r["exp"] for r in firehose_results]
-        eff = [r["effective_rate"] for r in firehose_results]
-        ax_fire.plot(exps, eff, marker="o")
-        ax_fire.set_xlabel("Exponent n (rate ≈ 2**n msg/s)")
-        ax_fire.set_ylabel("Effective throughput (msg/s)")
-        ax_fire.set_title("Firehose: throughput vs 2**n")
-        ax_fire.grid(True, linestyle="--", alpha=0.3)
-    except Exception:
-        ax_fire.text(0.5, 0.5, "Firehose plot failed", ha="center", va="center")
-
-    fig.tight_layout()
-    plt.show()
-
-
 # ---------------------------------------------------------------------------
 # CLI entry point
 # ---------------------------------------------------------------------------
@@ -657,61 +602,68 @@ def main() -> None:
     print("Starting unified HFT system test-exchange run.")
     print("Assuming the C++ HFT system is already running and UDP ports are configured via env vars.\n")
 
-    # 1) Functional + fuzz + latency tests using a shared client.
+    # 1)-4) share one client: the tests, the soak and both sweeps run over
+    # the same bound socket pair instead of re-creating it per stage.
     client = UdpClient()
     try:
         ok_functional = run_functional_tests(client)
         ok_fuzz = run_fuzz_tests(client)
         ok_latency = run_latency_smoke_test(client)
-    finally:
-        client.close()
-
-    print(
-        "\n=== Summary: pytest-style tests ===\n"
-        f"Functional tests: {'PASS' if ok_functional else 'FAIL'}\n"
-        f"Fuzz tests:       {'PASS' if ok_fuzz else 'FAIL'}\n"
-        f"Latency smoke:    {'PASS' if ok_latency else 'FAIL'}"
-    )
-
-    # 2) Standalone high-volume soak at "unlimited" rate (as fast as possible).
-    soak_output = "soak_results.csv"
-    run_soak(
-        num_messages=args.soak_messages,
-        output_path=soak_output,
-        symbol=args.symbol,
-        base_price=args.base_price,
-        rate=None,
-    )
-
-    # 3) Powers-of-two rate sweep + latency/RTT plots.
-    sweep_results, csv_paths = run_power_of_two_sweep(
-        messages=args.sweep_messages,
-        symbol=args.symbol,
-        base_price=args.base_price,
-        min_exp=args.sweep_min_exp,
-        max_exp=args.sweep_max_exp,
-        exp_step=args.sweep_exp_step,
-        p99_threshold=args.sweep_p99_threshold,
-    )
 
-    firehose_results: List[Dict[str, Any]] | None = None
+        print(
+            "\n=== Summary: pytest-style tests ===\n"
+            f"Functional tests: {'PASS' if ok_functional else 'FAIL'}\n"
+            f"Fuzz tests:       {'PASS' if ok_fuzz else 'FAIL'}\n"
+            f"Latency smoke:    {'PASS' if ok_latency else 'FAIL'}"
+        )
 
-    # 4) Optional: additional firehose throughput sweep (no per-message RTT).
-    if args.firehose_sweep:
-        firehose_results = run_firehose_sweep(
-            messages=args.firehose_messages,
+        # 2) Standalone high-volume soak at "unlimited" rate (as fast as possible).
+        soak_output = "soak_results.csv"
+        run_soak(
+            num_messages=args.soak_messages,
+            output_path=soak_output,
             symbol=args.symbol,
             base_price=args.base_price,
-            min_exp=args.sweep_min_exp,
-            max_exp=args.sweep_max_exp,
-            exp_step=args.sweep_exp_step,
+            rate=None,
+            client=client,
         )
 
+        points: List[Dict[str, Any]] | None = None
+
+        # 3)+4) With --firehose-sweep, one pass over the rates runs the RTT
+        # soak and the firehose (no per-message RTT) back to back per point;
+        # otherwise only the powers-of-two RTT sweep.
+        if args.firehose_sweep:
+            points = run_combined_sweep(
+                messages=args.sweep_messages,
+                firehose_messages=args.firehose_messages,
+                symbol=args.symbol,
+                base_price=args.base_price,
+                min_exp=args.sweep_min_exp,
+                max_exp=args.sweep_max_exp,
+                exp_step=args.sweep_exp_step,
+                p99_threshold=args.sweep_p99_threshold,
+                client=client,
+            )
+        else:
+            run_power_of_two_sweep(
+                messages=args.sweep_messages,
+                symbol=args.symbol,
+                base_price=args.base_price,
+                min_exp=args.sweep_min_exp,
+                max_exp=args.sweep_max_exp,
+                exp_step=args.sweep_exp_step,
+                p99_threshold=args.sweep_p99_threshold,
+                client=client,
+            )
+    finally:
+        client.close()
+
     # 5) Plots at the very end.
-    if not args.no_plots and csv_paths:
-        if firehose_results:
-            print("Generating three-panel summary figure (latency + firehose)...")
-            plot_summary_three_panel(csv_paths, sweep_results, firehose_results)
+    if not args.no_plots and points:
+        # Rendered in a separate Agg process; the run does not wait for it
+        proc = spawn_summary_plot(points)
+        print(f"Generating three-panel summary figure in the background (pid {proc.pid})...")
 
     print("\nUnified run complete.")
 
@@ -6,7 +6,8 @@ duplicating logic:
 
 - Soak logic from soak_benchmark.run_soak
 - Rate sweep structure inspired by rate_sweep
-- Latency loading from latency_plot.load_latencies_ns
+- Firehose benchmark and combined RTT + firehose sweep from run
+- Latency loading from latency_plot.load_rtt_us
 
 Usage (from project root, with the C++ HFT system already running and
 CLIENT_IN_PORT / EXCHANGE_IN_PORT set in the environment):
@@ -30,14 +31,19 @@ import sys
 from typing import Any, Dict, List, Tuple
 
 import matplotlib.pyplot as plt
+import numpy as np
 
 # NOTE: We use plain imports (not relative) so that this script can be run
 # directly as `python test-exchnage_2/run_2.py` without package context.
 from client import UdpClient
-from fix_utils import gen_new_order
-from latency_plot import load_latencies_ns
+from latency_plot import cdf_points, load_rtt_us
+from plot_sweep import spawn_summary_plot
+from run import run_combined_sweep
 from soak_benchmark import run_soak as soak_run_soak
 
+# CDF points drawn per series in the overlay plots; more are not visible
+CDF_OVERLAY_POINTS = 2000
+
 
 # ---------------------------------------------------------------------------
 # Pytest-style tests (reused, not reimplemented)
@@ -104,6 +110,7 @@ def run_power_of_two_sweep(
     max_exp: int,
     exp_step: int,
     p99_threshold: float,
+    client: UdpClient | None = None,
 ) -> Tuple[List[Dict[str, Any]], List[str]]:
     """
     Sweep powers-of-two send rates and stop when p99 latency degrades.
@@ -120,6 +127,11 @@ def run_power_of_two_sweep(
     csv_paths: List[str] = []
     prev_p99: float | None = None
 
+    # One socket pair for every point instead of re-binding per rate
+    owns_client = client is None
+    if client is None:
+        client = UdpClient()
+
     for exp in range(min_exp, max_exp + 1, max(1, exp_step)):
         requested_rate = float(2**exp)
         output_path = f"soak_2pow{exp}.csv"
@@ -131,6 +143,7 @@ def run_power_of_two_sweep(
             symbol=symbol,
             base_price=base_price,
             rate=requested_rate,
+            client=client,
         )
         if not stats:
             print("No stats returned; stopping sweep.")
@@ -154,6 +167,9 @@ def run_power_of_two_sweep(
 
         prev_p99 = p99
 
+    if owns_client:
+        client.close()
+
     if results:
         print("\nSweep complete. Collected points:")
         for r in results:
@@ -173,19 +189,16 @@ def plot_combined_latency_hist_and_cdf(
     csv_paths: List[str], sweep_results: List[Dict[str, Any]]
 ) -> None:
     """
-    Combined histogram and CDF overlays using latency_plot.load_latencies_ns.
+    Combined histogram and CDF overlays using latency_plot.load_rtt_us.
     """
-    series_latencies_us: List[Tuple[str, List[float]]] = []
+    series_latencies_us: List[Tuple[str, np.ndarray]] = []
 
     for stats, path in zip(sweep_results, csv_paths):
-        latencies_ns = load_latencies_ns(path)
-        if not latencies_ns:
+        latencies_us = load_rtt_us(path)
+        if not latencies_us.size:
             print(f"No latency data found in {path}; skipping in combined plot.")
             continue
 
-        latencies_us = [x / 1e3 for x in latencies_ns]
-        latencies_us.sort()
-
         exp = stats.get("exp")
         label = f"2^{exp}" if exp is not None else f"{stats.get('requested_rate', 0.0):.0f} msg/s"
         series_latencies_us.append((label, latencies_us))
@@ -199,7 +212,8 @@ def plot_combined_latency_hist_and_cdf(
     # Histogram overlay
     plt.subplot(1, 2, 1)
     for label, latencies_us in series_latencies_us:
-        plt.hist(latencies_us, bins=50, alpha=0.4, label=label)
+        counts, edges = np.histogram(latencies_us, bins=50)
+        plt.stairs(counts, edges, fill=True, alpha=0.4, label=label)
     plt.xlabel("RTT (µs)")
     plt.ylabel("Count")
     plt.title("Latency histogram (all rates)")
@@ -208,9 +222,7 @@ def plot_combined_latency_hist_and_cdf(
     # CDF overlay
     plt.subplot(1, 2, 2)
     for label, latencies_us in series_latencies_us:
-        n = len(latencies_us)
-        xs = latencies_us
-        ys = [i / (n - 1) for i in range(n)] if n > 1 else [1.0]
+        xs, ys = cdf_points(latencies_us, CDF_OVERLAY_POINTS)
         plt.plot(xs, ys, label=label)
     plt.xlabel("RTT (µs)")
     plt.ylabel("CDF")
@@ -221,193 +233,6 @@ def plot_combined_latency_hist_and_cdf(
     plt.show()
 
 
-# ---------------------------------------------------------------------------
-# Firehose benchmark (send without per-message wait)
-# ---------------------------------------------------------------------------
-
-
-def _firehose_run_once(
-    num_messages: int,
-    symbol: str,
-    base_price: float,
-    rate: float,
-    receive_window_s: float = 2.0,
-) -> Dict[str, Any]:
-    """
-    Send many messages without waiting for each individual response.
-    """
-    import time
-
-    client = UdpClient()
-    start_wall = time.perf_counter()
-
-    interval: float | None = None
-    if rate > 0:
-        interval = 1.0 / rate
-
-    # Phase 1: firehose send
-    for _ in range(num_messages):
-        loop_start = time.perf_counter()
-
-        price = round(base_price + (0.0), 2)  # no randomness needed here
-        qty = 100
-        msg = gen_new_order(symbol=symbol, price=price, qty=qty)
-        client.send(msg)
-
-        if interval is not None:
-            elapsed = time.perf_counter() - loop_start
-            remaining = interval - elapsed
-            if remaining > 0:
-                time.sleep(remaining)
-
-    # Phase 2: receive for a fixed window
-    responses = 0
-    recv_start = time.perf_counter()
-    while time.perf_counter() - recv_start < receive_window_s:
-        resp = client.receive()
-        if resp is not None:
-            responses += 1
-
-    total_wall = time.perf_counter() - start_wall
-    client.close()
-
-    effective_rate = responses / total_wall if total_wall > 0 else 0.0
-    return {
-        "requested_rate": rate,
-        "effective_rate": effective_rate,
-        "sent": num_messages,
-        "responses": responses,
-        "receive_window_s": receive_window_s,
-        "total_wall_s": total_wall,
-    }
-
-
-def run_firehose_sweep(
-    messages: int,
-    symbol: str,
-    base_price: float,
-    min_exp: int,
-    max_exp: int,
-    exp_step: int,
-) -> List[Dict[str, Any]]:
-    """
-    Sweep powers-of-two offered load using the firehose benchmark.
-    """
-    print(
-        "\n=== Firehose throughput sweep (no per-message RTT wait) ===\n"
-        f"Messages per rate point: {messages}, exponents: {min_exp}..{max_exp} "
-        f"(step {exp_step})"
-    )
-
-    results: List[Dict[str, Any]] = []
-
-    for exp in range(min_exp, max_exp + 1, max(1, exp_step)):
-        requested_rate = 2**exp
-        print(f"\n--- Firehose rate 2**{exp} ---")
-
-        stats = _firehose_run_once(
-            num_messages=messages,
-            symbol=symbol,
-            base_price=base_price,
-            rate=float(requested_rate),
-        )
-        stats["exp"] = exp
-        results.append(stats)
-
-        print(
-            f"requested_rate≈2**{exp}, sent={stats['sent']}, "
-            f"responses={stats['responses']}, "
-            f"effective_rate≈{stats['effective_rate']:.1f} msg/s"
-        )
-
-    if results:
-        print("\nFirehose sweep complete. Collected points:")
-        for r in results:
-            print(
-                f"  2**{r['exp']}: requested≈2**{r['exp']}, "
-                f"effective_rate≈{r['effective_rate']:.1f} msg/s, "
-                f"responses={r['responses']}/{r['sent']}"
-            )
-    else:
-        print("\nFirehose sweep produced no data.")
-
-    # Plotting is handled by the caller so we can combine graphs.
-    return results
-
-
-def plot_three_panel_summary(
-    csv_paths: List[str],
-    sweep_results: List[Dict[str, Any]],
-    firehose_results: List[Dict[str, Any]],
-) -> None:
-    """
-    Single figure with three panels:
-    - Left: latency histogram overlay (RTT-based sweep)
-    - Middle: latency CDF overlay (RTT-based sweep)
-    - Right: firehose effective throughput vs exponent (2**n)
-    """
-    if not sweep_results or not csv_paths or not firehose_results:
-        print("Not enough data to build three-panel summary figure.")
-        return
-
-    fig, (ax_hist, ax_cdf, ax_fire) = plt.subplots(1, 3, figsize=(15, 4))
-
-    # Build latency series from CSVs.
-    series_latencies_us: List[Tuple[str, List[float]]] = []
-    for stats, path in zip(sweep_results, csv_paths):
-        latencies_ns = load_latencies_ns(path)
-        if not latencies_ns:
-            continue
-        latencies_us = [x / 1e3 for x in latencies_ns]
-        latencies_us.sort()
-        exp = stats.get("exp")
-        label = f"2^{exp}" if exp is not None else f"{stats.get('requested_rate', 0.0):.0f} msg/s"
-        series_latencies_us.append((label, latencies_us))
-
-    if not series_latencies_us:
-        print("No latency data found for summary figure.")
-        return
-
-    # Left: histogram overlay
-    for label, latencies_us in series_latencies_us:
-        ax_hist.hist(latencies_us, bins=50, alpha=0.4, label=label)
-    ax_hist.set_xlabel("RTT (µs)")
-    ax_hist.set_ylabel("Count")
-    ax_hist.set_title("Latency histogram (all rates)")
-    ax_hist.legend(fontsize="small")
-
-    # Middle: CDF overlay
-    for label, latencies_us in series_latencies_us:
-        n = len(latencies_us)
-        xs = latencies_us
-        ys = [i / (n - 1) for i in range(n)] if n > 1 else [1.0]
-        ax_cdf.plot(xs, ys, label=label)
-    ax_cdf.set_xlabel("RTT (µs)")
-    ax_cdf.set_ylabel("CDF")
-    ax_cdf.set_title("Latency CDF (all rates)")
-    ax_cdf.legend(fontsize="small")
-
-    # Right: firehose throughput vs exponent
-    try:
-        exps = [r["exp"] for r in firehose_results]
-        eff = [r["effective_rate"] for r in firehose_results]
-        ax_fire.plot(exps, eff, marker="o")
-        ax_fire.set_xlabel("Exponent n (rate ≈ 2**n msg/s)")
-        ax_fire.set_ylabel("Effective throughput (msg/s)")
-        ax_fire.set_title("Firehose: throughput vs 2**n")
-        ax_fire.grid(True, linestyle="--", alpha=0.3)
-    except Exception:
-        ax_fire.text(0.5, 0.5, "Firehose plot failed", ha="center", va="center")
-
-    fig.tight_layout()
-    plt.show()
-
-
-# ---------------------------------------------------------------------------
-# CLI entry point
-# ---------------------------------------------------------------------------
-
-
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Unified functional/fuzz/latency/volume runner (import-based)."
@@ -428,58 +253,53 @@ def main() -> None:
     # If run with no extra flags, this already matches the desired preset.
     print("Starting import-based HFT system test-exchange run (run_2.py).")
 
-    # 1) Functional + fuzz + latency tests using a shared client.
+    # 1)-4) share one client: the tests, the soak and both sweeps run over
+    # the same bound socket pair instead of re-creating it per stage.
     client = UdpClient()
     try:
         ok_functional = run_functional_tests(client)
         ok_fuzz = run_fuzz_tests(client)
         ok_latency = run_latency_smoke_test(client)
-    finally:
-        client.close()
-
-    print(
-        "\n=== Summary: pytest-style tests ===\n"
-        f"Functional tests: {'PASS' if ok_functional else 'FAIL'}\n"
-        f"Fuzz tests:       {'PASS' if ok_fuzz else 'FAIL'}\n"
-        f"Latency smoke:    {'PASS' if ok_latency else 'FAIL'}"
-    )
 
-    # 2) Standalone high-volume soak at "unlimited" rate.
-    soak_output = "soak_results.csv"
-    soak_run_soak(
-        num_messages=args.soak_messages,
-        output_path=soak_output,
-        symbol=args.symbol,
-        base_price=args.base_price,
-        rate=None,
-    )
+        print(
+            "\n=== Summary: pytest-style tests ===\n"
+            f"Functional tests: {'PASS' if ok_functional else 'FAIL'}\n"
+            f"Fuzz tests:       {'PASS' if ok_fuzz else 'FAIL'}\n"
+            f"Latency smoke:    {'PASS' if ok_latency else 'FAIL'}"
+        )
 
-    # 3) RTT-based sweep (latency distributions).
-    sweep_results, csv_paths = run_power_of_two_sweep(
-        messages=args.sweep_messages,
-        symbol=args.symbol,
-        base_price=args.base_price,
-        min_exp=args.sweep_min_exp,
-        max_exp=args.sweep_max_exp,
-        exp_step=args.sweep_exp_step,
-        p99_threshold=args.sweep_p99_threshold,
-    )
+        # 2) Standalone high-volume soak at "unlimited" rate.
+        soak_output = "soak_results.csv"
+        soak_run_soak(
+            num_messages=args.soak_messages,
+            output_path=soak_output,
+            symbol=args.symbol,
+            base_price=args.base_price,
+            rate=None,
+            client=client,
+        )
 
-    # 4) Firehose throughput sweep.
-    firehose_results = run_firehose_sweep(
-        messages=args.firehose_messages,
-        symbol=args.symbol,
-        base_price=args.base_price,
-        min_exp=args.sweep_min_exp,
-        max_exp=args.sweep_max_exp,
-        exp_step=args.sweep_exp_step,
-    )
+        # 3)+4) RTT-based sweep (latency distributions) and firehose
+        # throughput sweep, fused into one pass over the rates.
+        points = run_combined_sweep(
+            messages=args.sweep_messages,
+            firehose_messages=args.firehose_messages,
+            symbol=args.symbol,
+            base_price=args.base_price,
+            min_exp=args.sweep_min_exp,
+            max_exp=args.sweep_max_exp,
+            exp_step=args.sweep_exp_step,
+            p99_threshold=args.sweep_p99_threshold,
+            client=client,
+        )
+    finally:
+        client.close()
 
     # 5) Plots from sweep CSVs (hist + CDF) plus firehose curve.
-    if not args.no_plots and csv_paths:
-        if firehose_results:
-            print("Generating three-panel summary figure (latency + firehose)...")
-            plot_three_panel_summary(csv_paths, sweep_results, firehose_results)
+    if not args.no_plots and points:
+        # Rendered in a separate Agg process; the run does not wait for it
+        proc = spawn_summary_plot(points)
+        print(f"Generating three-panel summary figure in the background (pid {proc.pid})...")
 
     print("\nrun_2 complete.")
 
@@ -20,126 +20,284 @@ Examples:
 
     # Run 5k messages at ~512 msgs/sec
     python -m test-exchnage_2.soak_benchmark --messages 5000 --rate 512 --output soak_512.csv
+
+    # Keep 64 orders in flight to measure latency above the 1/RTT rate ceiling
+    python -m test-exchnage_2.soak_benchmark --messages 50000 --window 64 --output soak_w64.csv
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
-import statistics
-import random
+import os
+from time import perf_counter, perf_counter_ns, sleep
 from typing import List
 
+import numpy as np
+
 # Support both package-style (`python -m test-exchnage_2.soak_benchmark`)
 # and direct script execution (`python test-exchnage_2/soak_benchmark.py`)
 try:  # pragma: no cover - import fallback logic
     from .client import UdpClient  # type: ignore[import]
-    from .fix_utils import gen_new_order, parse_fix  # type: ignore[import]
+    from .fix_utils import get_field, precompute_orders  # type: ignore[import]
 except ImportError:
     from client import UdpClient  # type: ignore[import]
-    from fix_utils import gen_new_order, parse_fix  # type: ignore[import]
+    from fix_utils import get_field, precompute_orders  # type: ignore[import]
+
+# Distinct pre-generated orders cycled through by run_soak (a power of two)
+ORDER_RING_SIZE = 1024
+ORDER_RING_MASK = ORDER_RING_SIZE - 1
+
+# ClOrdID field appended by run_soak_pipelined; carries the send sequence number
+_CLORDID_FIELD = b"11=%d\x01"
 
 
 def run_soak(
     num_messages: int,
-    output_path: str,
+    output_path: str | None,
     symbol: str,
     base_price: float,
     rate: float | None,
+    client: UdpClient | None = None,
 ) -> dict | None:
-    import time
-
-    client = UdpClient()
-    latencies_ns: List[int] = []
-    start_wall = time.perf_counter()
-
+    # Orders are built once up front (price/qty jitter included) and sent
+    # round-robin, so the timed loop does no message construction.
+    orders = precompute_orders(ORDER_RING_SIZE, symbol, base_price)
+
+    # A caller running several points passes one client for all of them;
+    # drop anything a previous point left queued so it is not timed here.
+    owns_client = client is None
+    if client is None:
+        client = UdpClient()
+    else:
+        client.drain()
+    # Filled in place: one contiguous int64 slot per message, no boxed ints
+    latencies_ns = np.empty(num_messages, dtype=np.int64)
+    count = 0
+    start_wall = perf_counter()
+
+    # Per-message rows are kept in memory and written once after the run, so
+    # no CSV formatting or file I/O happens inside the timed loop. The CSV is
+    # optional; the returned stats always carry the raw latencies.
+    rows: List[tuple] | None = [] if output_path else None
+
+    # Pace against absolute integer-ns deadlines rather than per-iteration
+    # elapsed time, so the schedule does not drift at high rates.
+    interval_ns: int | None = None
+    if rate and rate > 0:
+        interval_ns = int(1e9 / rate)
+    next_deadline_ns = perf_counter_ns()
+
+    # Bound methods resolved once rather than looked up every iteration
+    send_and_receive_times = client.send_and_receive_times
+    append_row = rows.append if rows is not None else None
+
+    for i in range(num_messages):
+        msg = orders[i & ORDER_RING_MASK]
+
+        response, send_ns, recv_ns = send_and_receive_times(msg)
+        rtt_ns = recv_ns - send_ns
+        if response is not None:
+            latencies_ns[count] = rtt_ns
+            count += 1
+
+        if append_row is not None:
+            # The raw response is kept; _write_rows extracts its MsgType
+            append_row((i, send_ns, recv_ns, rtt_ns, response))
+
+        # Throttle to approximate the requested send rate, if provided.
+        if interval_ns is not None:
+            next_deadline_ns += interval_ns
+            slack_ns = next_deadline_ns - perf_counter_ns()
+            if slack_ns > 0:
+                sleep(slack_ns * 1e-9)
+
+    if owns_client:
+        client.close()
+    total_wall = perf_counter() - start_wall
+
+    if rows is not None:
+        _write_rows(output_path, rows)
+
+    return _summarize(latencies_ns[:count], total_wall, rate, output_path)
+
+
+def run_soak_pipelined(
+    num_messages: int,
+    output_path: str | None,
+    symbol: str,
+    base_price: float,
+    window: int = 64,
+    client: UdpClient | None = None,
+) -> dict | None:
+    """
+    Like run_soak, but keeps up to `window` orders in flight instead of one,
+    so offered load is not capped at 1/RTT.
+
+    Each order carries its send sequence number as ClOrdID (11), echoed
+    back on the execution report, so every response is matched to its own
+    send time even when replies arrive out of order. In-flight state is kept
+    per ring slot (seq % ORDER_RING_SIZE); replies whose sequence number is
+    not the one in flight in its slot (foreign, duplicate or stale) are
+    ignored. An order still unanswered when its slot comes round again is
+    retired as lost. A response timeout ends the run; whatever is still in
+    flight then counts as lost too.
+    """
+    # In-flight state is per ring slot, so the window cannot exceed the ring
+    window = max(1, min(window, ORDER_RING_SIZE))
+    orders = precompute_orders(ORDER_RING_SIZE, symbol, base_price)
+    send_ns_by_slot = [0] * ORDER_RING_SIZE
+    seq_by_slot = [0] * ORDER_RING_SIZE
+    outstanding = [False] * ORDER_RING_SIZE
+
+    owns_client = client is None
+    if client is None:
+        client = UdpClient()
+    else:
+        client.drain()
+    latencies_ns = np.empty(num_messages, dtype=np.int64)
+    count = 0
+    rows: List[tuple] | None = [] if output_path else None
+    start_wall = perf_counter()
+
+    send_timed = client.send_timed
+    receive_timed = client.receive_timed
+
+    sent = 0
+    in_flight = 0
+    retired = 0
+    while sent < num_messages or in_flight:
+        while in_flight < window and sent < num_messages:
+            slot = sent & ORDER_RING_MASK
+            if outstanding[slot]:
+                # The order from one ring lap ago never got its reply
+                in_flight -= 1
+                retired += 1
+            send_ns_by_slot[slot] = send_timed(orders[slot] + _CLORDID_FIELD % sent)
+            seq_by_slot[slot] = sent
+            outstanding[slot] = True
+            sent += 1
+            in_flight += 1
+
+        response, recv_ns = receive_timed()
+        if response is None:
+            break
+        try:
+            seq = int(get_field(response, "11"))
+        except ValueError:
+            continue  # not a reply to one of our orders
+        slot = seq & ORDER_RING_MASK
+        if not outstanding[slot] or seq_by_slot[slot] != seq:
+            continue  # foreign ClOrdID, or a duplicate/stale reply
+        outstanding[slot] = False
+        in_flight -= 1
+        send_ns = send_ns_by_slot[slot]
+        rtt_ns = recv_ns - send_ns
+        latencies_ns[count] = rtt_ns
+        count += 1
+        if rows is not None:
+            rows.append((seq, send_ns, recv_ns, rtt_ns, response))
+
+    if owns_client:
+        client.close()
+    total_wall = perf_counter() - start_wall
+
+    if retired:
+        print(f"Retired {retired} orders unanswered after a full ring lap.")
+    if in_flight:
+        print(f"Timed out with {in_flight} of {sent} orders unanswered.")
+    if rows is not None:
+        rows.sort()
+        _write_rows(output_path, rows)
+
+    stats = _summarize(latencies_ns[:count], total_wall, None, output_path)
+    if stats:
+        stats["window"] = window
+        stats["lost"] = in_flight + retired
+    return stats
+
+
+def _write_rows(output_path: str, rows: List[tuple]) -> None:
+    """Write (seq, send_ns, recv_ns, rtt_ns, raw response or None) rows as the soak CSV."""
     with open(output_path, mode="w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["seq", "send_ns", "recv_ns", "rtt_ns", "msg_type"])
+        writer.writerows(
+            (seq, send_ns, recv_ns, rtt_ns, get_field(response, "35") if response else "")
+            for seq, send_ns, recv_ns, rtt_ns, response in rows
+        )
+
 
-        interval: float | None = None
-        if rate and rate > 0:
-            interval = 1.0 / rate
-
-        for i in range(num_messages):
-            loop_start = time.perf_counter()
-
-            # Add a bit of randomness around the base price to simulate market movement.
-            price = round(base_price + random.uniform(-1.0, 1.0), 2)
-            qty = random.randint(1, 500)
-
-            msg = gen_new_order(symbol=symbol, price=price, qty=qty)
-
-            response, send_ns, recv_ns = client.send_and_receive_times(msg)
-            rtt_ns = recv_ns - send_ns
-            msg_type = ""
-            if response is not None:
-                parsed = parse_fix(response)
-                msg_type = parsed.get("35", "")
-                latencies_ns.append(rtt_ns)
-
-            writer.writerow([i, send_ns, recv_ns, rtt_ns, msg_type])
-
-            # Throttle to approximate the requested send rate, if provided.
-            if interval is not None:
-                elapsed = time.perf_counter() - loop_start
-                remaining = interval - elapsed
-                if remaining > 0:
-                    time.sleep(remaining)
-
-    client.close()
-    total_wall = time.perf_counter() - start_wall
-
-    if latencies_ns:
-        latencies_ns.sort()
-        count = len(latencies_ns)
-        p50 = _percentile(latencies_ns, 50)
-        p99 = _percentile(latencies_ns, 99)
-        jitter = statistics.pstdev(latencies_ns) if count > 1 else 0.0
+def _summarize(
+    lat: np.ndarray,
+    total_wall: float,
+    rate: float | None,
+    output_path: str | None,
+) -> dict | None:
+    if lat.size:
+        count = lat.size
+        # One call for every percentile; NumPy's default "linear" method
+        p50, p95, p99, p999 = (float(q) for q in np.percentile(lat, [50, 95, 99, 99.9]))
+        lat_min = int(lat.min())
+        lat_max = int(lat.max())
+        jitter = float(lat.std()) if count > 1 else 0.0
         effective_rate = count / total_wall if total_wall > 0 else 0.0
 
         print(
             f"Collected {count} responses.\n"
-            f"min={latencies_ns[0]/1e3:.1f} µs, "
+            f"min={lat_min/1e3:.1f} µs, "
             f"p50={p50/1e3:.1f} µs, "
+            f"p95={p95/1e3:.1f} µs, "
             f"p99={p99/1e3:.1f} µs, "
-            f"max={latencies_ns[-1]/1e3:.1f} µs, "
+            f"p999={p999/1e3:.1f} µs, "
+            f"max={lat_max/1e3:.1f} µs, "
             f"jitter(stddev)={jitter/1e3:.1f} µs\n"
             f"Effective throughput ≈ {effective_rate:.1f} msg/s"
         )
-        print(f"Results written to {output_path}")
+        if output_path:
+            print(f"Results written to {output_path}")
 
         return {
             "requested_rate": rate,
             "effective_rate": effective_rate,
             "count": count,
-            "min": latencies_ns[0],
+            "min": lat_min,
             "p50": p50,
+            "p95": p95,
             "p99": p99,
-            "max": latencies_ns[-1],
+            "p999": p999,
+            "max": lat_max,
             "jitter": jitter,
             "total_wall_s": total_wall,
             "output_path": output_path,
+            "latencies_ns": lat,
         }
 
     print("No responses received; check that the HFT system is running and ports are correct.")
     return None
 
 
-def _percentile(sorted_values: List[int], pct: float) -> float:
+def pin_sender(cpu: int | None = None, fifo_priority: int | None = None) -> None:
     """
-    Simple percentile helper: pct in [0, 100].
+    Pin the benchmark process to one CPU and optionally run it under
+    SCHED_FIFO, so the send/receive loop is neither migrated nor preempted
+    by housekeeping work mid-measurement.
+
+    Meant for a core reserved with the isolcpus= boot parameter (start the
+    script under `taskset -c <core>`); SCHED_FIFO needs CAP_SYS_NICE. Either
+    setting is skipped with a message if the platform or privileges do not
+    allow it.
     """
-    if not sorted_values:
-        return 0.0
-    k = (len(sorted_values) - 1) * pct / 100.0
-    f = int(k)
-    c = min(f + 1, len(sorted_values) - 1)
-    if f == c:
-        return float(sorted_values[f])
-    d0 = sorted_values[f] * (c - k)
-    d1 = sorted_values[c] * (k - f)
-    return d0 + d1
+    if cpu is not None:
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except (AttributeError, OSError) as exc:
+            print(f"CPU affinity {cpu} not applied: {exc}")
+    if fifo_priority is not None:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(fifo_priority))
+        except (AttributeError, OSError) as exc:
+            print(f"SCHED_FIFO priority {fifo_priority} not applied: {exc}")
 
 
 def main() -> None:
@@ -175,8 +333,33 @@ def main() -> None:
         help="Target send rate in messages per second (default: unlimited/as fast as possible)",
     )
 
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=None,
+        help="Keep up to this many orders in flight instead of one at a time; --rate is ignored "
+             "(default: strictly one request/response)",
+    )
+
+    parser.add_argument(
+        "--cpu",
+        type=int,
+        default=None,
+        help="Pin the benchmark to this CPU, ideally one reserved with isolcpus= (default: no pinning)",
+    )
+    parser.add_argument(
+        "--fifo-priority",
+        type=int,
+        default=None,
+        help="Run under SCHED_FIFO at this priority; needs CAP_SYS_NICE (default: normal scheduling)",
+    )
+
     args = parser.parse_args()
-    run_soak(args.messages, args.output, args.symbol, args.base_price, args.rate)
+    pin_sender(args.cpu, args.fifo_priority)
+    if args.window:
+        run_soak_pipelined(args.messages, args.output, args.symbol, args.base_price, args.window)
+    else:
+        run_soak(args.messages, args.output, args.symbol, args.base_price, args.rate)
 
 
 if __name__ == "__main__":
@@ -8,7 +8,7 @@ that:
   - Reject (35=3)
 """
 
-from fix_utils import gen_new_order, parse_fix
+from fix_utils import SOH, gen_new_order, get_field
 
 
 def test_order_acknowledgment(client):
@@ -18,15 +18,13 @@ def test_order_acknowledgment(client):
 
     assert response is not None, "No response from HFT system within timeout"
 
-    # 2. Parse and assert basic semantics
-    parsed = parse_fix(response)
-
-    msg_type = parsed.get("35")
+    # 2. Assert basic semantics; only 35 and 150 matter, so they are found
+    # directly in the raw message instead of parsing every field
+    msg_type = get_field(response, "35")
     assert msg_type in {"8", "3"}, f"Expected Execution Report (8) or Reject (3), got {msg_type!r}"
 
     # Example extra assertion for ExecType when we received an Execution Report.
     if msg_type == "8":
-        exec_type = parsed.get("150")
-        assert exec_type is not None, "Execution Report missing ExecType (150)"
+        assert SOH + "150=" in response, "Execution Report missing ExecType (150)"
 
 